@@ -10,21 +10,38 @@ A module to run search algorithms on a game of tic tac toe.
 """
 
 from functools import lru_cache
+import os
+import sys
 import tictactoe
 from tictactoedata import BLANK_GAME_3D, X_TAKEN_CENTER, X_ONE_AWAY, FORCED_GAME, TEST_GAME
 import numpy as np
 from hashlib import sha1
 
+# The line counts are shared with the two player game in the directory above.
+# Appending keeps this directory's tictactoe and tictactoedata ahead of the two player ones.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tictactoelines  # pylint: disable=C0413
+
+# The player whose marks are at each index of the first axis of a game.
+PLAYERS = (Player.X, Player.O, Player.R)
+
 
 class TicTacToeWrapper:
     """
     A lite wrapper class to define hashable behavior for caching.
     """
 
-    def __init__(self, data):
+    def __init__(self, data, counts=None, winner=None):
         self.data = data
         # This method copied from https://stackoverflow.com/a/5173201
         self.hash = int(sha1(data.view(np.bool)).hexdigest(), 16)
+        # The marks on every line, kept up to date by play so it only has to check the lines through its move.
+        if counts is None:
+            counts = tictactoelines.line_counts(data)
+            winner = next((player for player in range(len(data)) if tictactoelines.has_won(counts, player)), None)
+        self.counts = counts
+        # The index of the first player along the data's first axis with three in a row, or None.
+        self.winner = winner
 
     def __hash__(self):
         return self.hash
@@ -39,13 +56,9 @@ def utility(wrapper):
     :param wrapper: The TicTacToeWrapper to evaluate for utility.
     :return:        The utility of tic tac toe if terminal, else None.
     """
-    if tictactoe.has_won_3d(wrapper.data[0]):
-        return Player.X
-    elif tictactoe.has_won_3d(wrapper.data[1]):
-        return Player.O
-    elif tictactoe.has_won_3d(wrapper.data[2]):
-        return Player.R
-    elif tictactoe.game_over_3d(wrapper.data):
+    if wrapper.winner is not None:
+        return PLAYERS[wrapper.winner]
+    elif np.all(np.any(wrapper.data, axis=0)):
         return 0
     else:
         return None
@@ -61,7 +74,11 @@ def play(wrapper, action, turn):
     """
     new_copy = np.copy(wrapper.data)
     new_copy[turn][action] = True
-    return TicTacToeWrapper(new_copy)
+    counts, completed = tictactoelines.place(wrapper.counts, int(np.ravel_multi_index(action, (3, 3, 3))), turn)
+    winner = wrapper.winner
+    if completed and (winner is None or turn < winner):
+        winner = turn
+    return TicTacToeWrapper(new_copy, counts, winner)
 
 
 def min_max_value(wrapper, turn):
@@ -134,18 +151,16 @@ def min_max_action(wrapper, turn):
     """
     Returns the best action in tic tac toe given a game and the current turn.
     :param wrapper: The TicTacToeWrapper to search.
-    :param turn:    A boolean indicating if it's x's turn (True) or not (False).
+    :param turn:    The index of the player to move, 0 for X, 1 for O, and 2 for R.
     :return:        The best action for the player indicated by the turn flag.
                     All actions if there isn't any.
     """
     actions = possible_actions(wrapper)
     tying_action = None
     for action in actions:
-        successor = play(wrapper, action)
-        value = min_max_value(successor, turn)
-        if turn and value == 1:
-            return action
-        if not turn and value == -1:
+        successor = play(wrapper, action, turn)
+        value = min_max_value(successor, (turn + 1) % 3)
+        if value == PLAYERS[turn]:
             return action
         if value == 0:
             tying_action = action
@@ -0,0 +1,75 @@
+"""
+A collection of unit-tests for the three player tictactoesearch.py in this directory.
+Run it from this directory, so this directory's tictactoe modules are the ones imported.
+"""
+
+import unittest
+import numpy as np
+# The functions we are testing are from this module.
+import tictactoesearch
+from tictactoesearch import Player
+from tictactoedata import reshape, X, O, R, _
+
+# R to move with four empty cells. Taking (2, 0, 0) wins for R, and most of the other cells let X win.
+R_CAN_WIN = reshape(np.array([
+    [
+        [O, R, O],
+        [_, O, O],
+        [R, R, X],
+    ],
+    [
+        [O, X, R],
+        [R, X, R],
+        [O, O, X],
+    ],
+    [
+        [_, X, R],
+        [X, _, X],
+        [_, X, O],
+    ],
+]))
+
+# X to move, and whichever cell X takes, O wins.
+X_LOSES = reshape(np.array([
+    [
+        [R, _, R],
+        [X, O, _],
+        [O, _, O],
+    ],
+    [
+        [X, R, R],
+        [O, X, X],
+        [X, R, O],
+    ],
+    [
+        [X, O, X],
+        [R, _, R],
+        [_, O, _],
+    ],
+]))
+
+
+class TestMinMaxAction(unittest.TestCase):
+    """
+    A test case for the tictactoesearch.min_max_action function.
+    """
+
+    def test_picks_own_win(self):
+        """
+        The player to move should pick the action that wins for them, not the first action that wins for anyone.
+        """
+        wrapper = tictactoesearch.TicTacToeWrapper(R_CAN_WIN)
+        action = tictactoesearch.min_max_action(wrapper, 2)
+        self.assertEqual(action, (2, 0, 0))
+        self.assertEqual(tictactoesearch.min_max_value(tictactoesearch.play(wrapper, action, 2), 0), Player.R)
+
+    def test_no_good_action(self):
+        """
+        With no action that wins or ties, every action is given back.
+        """
+        wrapper = tictactoesearch.TicTacToeWrapper(X_LOSES)
+        self.assertEqual(tictactoesearch.min_max_action(wrapper, 0), tictactoesearch.possible_actions(wrapper))
+
+
+if __name__ == '__main__':
+    unittest.main()
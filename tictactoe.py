@@ -2,19 +2,12 @@
 A module of useful functions for tic-tac-toe games
 """
 
-# Use this as a helper function for some tedious iterations.
-from itertools import product
 # Use this to manipulate tic-tac-toe data.
 import numpy as np
 # Use this to bring in data definitions, and some examples to test on.
 import tictactoedata as data
 
 
-# Documentation of product function.
-# "Cartesian product of input iterables.
-# For example, product(A, repeat=4) means the same as product(A, A, A, A)."
-# This is useful for available_spots.
-
 # A function to give all the possible actions for players in a game.
 def available_spots(game):
     """
@@ -22,8 +15,8 @@ def available_spots(game):
     :param: game    Any tic-tac-toe structure.
     :return:        An iterable of available spots for marks.
     """
-    return list(filter(lambda coordinate_tuple: not game[0][coordinate_tuple] and not game[1][coordinate_tuple],
-                       product(range(3), repeat=game.ndim - 1)))
+    # argwhere lists the coordinates of empty spots in row-major order, the same order itertools.product gives.
+    return list(map(tuple, np.argwhere(~np.bitwise_or(game[0], game[1])).tolist()))
 
 
 def has_won_2d(board):
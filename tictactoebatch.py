@@ -0,0 +1,73 @@
+"""
+A module of vectorized versions of the tictactoe game-over checks, over stacks of games.
+
+A stack of games is a tic-tac-toe structure with one extra leading axis,
+so a stack of N 3d games has the shape (N, 2, 3, 3, 3).
+"""
+
+from collections import namedtuple
+# Use this to manipulate stacks of tic-tac-toe data.
+import numpy as np
+# Use this for the table of winning lines.
+import tictactoelines
+
+
+def line_incidence(ndim):
+    """
+    Builds a matrix saying which cells are on which winning lines.
+    :param ndim:    The number of dimensions of the game (2 or 3).
+    :return:        A (lines, cells) matrix, with a 1 where a cell lies on a line and a 0 elsewhere.
+    """
+    lines = tictactoelines.winning_lines(ndim)
+    incidence = np.zeros((len(lines), 3 ** ndim), dtype=np.float32)
+    for line_number, line in enumerate(lines):
+        incidence[line_number, list(line)] = 1
+    return incidence
+
+
+# Multiplying a stack of flattened boards by the transposed incidence matrix counts every player's marks on every line.
+# These are float32 so the product goes through BLAS; the counts are small integers, which float32 holds exactly.
+LINE_INCIDENCE = {2: line_incidence(2), 3: line_incidence(3)}
+
+# The status of every game in a stack, as boolean arrays.
+GameStatus = namedtuple('GameStatus', ['x_won', 'o_won', 'tied', 'ongoing'])
+
+
+def has_won_batch(boards):
+    """
+    Returns which boards in a stack have been won, matching has_won_2d and has_won_3d.
+    :param boards:  A (N, 3, 3) or (N, 3, 3, 3) stack of one player's marks.
+    :return:        A boolean array of length N, True where there are three marks in a row.
+    """
+    ndim = boards.ndim - 1
+    incidence = LINE_INCIDENCE[ndim]
+    # The number of cells is spelled out, since -1 can't be worked out for an empty stack.
+    line_counts = boards.reshape(len(boards), 3 ** ndim).astype(np.float32) @ incidence.T
+    return (line_counts == 3).any(axis=1)
+
+
+def game_over_batch(games):
+    """
+    Returns which games in a stack are over, matching game_over_2d and game_over_3d.
+    :param games:   A (N, 2, 3, 3) or (N, 2, 3, 3, 3) stack of games.
+    :return:        A boolean array of length N, True where the game is won or tied.
+    """
+    status = status_batch(games)
+    return ~status.ongoing
+
+
+def status_batch(games):
+    """
+    Classifies every game in a stack as won, tied, or ongoing.
+    :param games:   A (N, 2, 3, 3) or (N, 2, 3, 3, 3) stack of games.
+    :return:        A GameStatus of boolean arrays of length N.
+                    x_won and o_won follow has_won for each player,
+                    tied is set for full boards nobody has won, and ongoing for every other game.
+    """
+    games = np.asarray(games, dtype=bool)
+    # Both players' boards go through the same product, as one stack of 2N boards.
+    won = has_won_batch(games.reshape((-1,) + games.shape[2:])).reshape(len(games), 2)
+    full = (games[:, 0] | games[:, 1]).reshape(len(games), 3 ** (games.ndim - 2)).all(axis=1)
+    x_won, o_won = won[:, 0], won[:, 1]
+    tied = full & ~x_won & ~o_won
+    return GameStatus(x_won, o_won, tied, ~(x_won | o_won | full))
@@ -0,0 +1,66 @@
+"""
+A collection of unit-tests for tictactoebatch.py.
+"""
+
+import unittest
+# Use this to build stacks of games.
+import numpy as np
+# The functions we are checking the batch versions against.
+import tictactoe
+# The functions we are testing are from this module.
+import tictactoebatch
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+# Every 2d and 3d example, including every frame of the recorded games.
+EXAMPLES_2D = np.array([value for value in vars(data).values()
+                        if hasattr(value, 'shape') and value.shape == (2, 3, 3)])
+EXAMPLES_3D = np.array([value for value in vars(data).values()
+                        if hasattr(value, 'shape') and value.shape == (2, 3, 3, 3)] + data.GAME_1 + data.GAME_2)
+
+
+class TestBatchChecks(unittest.TestCase):
+    """
+    A test case comparing the batch checks against the one-game checks in tictactoe.
+    """
+
+    def test_has_won(self):
+        """
+        Every board in a stack should be won exactly when has_won says so.
+        """
+        self.assertEqual(list(tictactoebatch.has_won_batch(EXAMPLES_2D[:, 0])),
+                         [tictactoe.has_won_2d(game[0]) for game in EXAMPLES_2D])
+        self.assertEqual(list(tictactoebatch.has_won_batch(EXAMPLES_3D[:, 1])),
+                         [tictactoe.has_won_3d(game[1]) for game in EXAMPLES_3D])
+
+    def test_game_over(self):
+        """
+        Every game in a stack should be over exactly when game_over says so.
+        """
+        self.assertEqual(list(tictactoebatch.game_over_batch(EXAMPLES_2D)),
+                         [tictactoe.game_over_2d(game) for game in EXAMPLES_2D])
+        self.assertEqual(list(tictactoebatch.game_over_batch(EXAMPLES_3D)),
+                         [tictactoe.game_over_3d(game) for game in EXAMPLES_3D])
+
+    def test_status(self):
+        """
+        The tied example is tied, the won examples are won, and a blank game is ongoing.
+        """
+        status = tictactoebatch.status_batch(np.array([data.TIED_2D, data.X_WON_2D, data.O_WON_2D, data.BLANK_GAME_2D]))
+        self.assertEqual(list(status.tied), [True, False, False, False])
+        self.assertEqual(list(status.x_won), [False, True, False, False])
+        self.assertEqual(list(status.o_won), [False, False, True, False])
+        self.assertEqual(list(status.ongoing), [False, False, False, True])
+
+    def test_empty(self):
+        """
+        An empty stack of games should give empty results, not fail to reshape.
+        """
+        for shape in ((0, 2, 3, 3), (0, 2, 3, 3, 3)):
+            status = tictactoebatch.status_batch(np.zeros(shape, dtype=bool))
+            self.assertEqual([len(array) for array in status], [0, 0, 0, 0])
+            self.assertEqual(len(tictactoebatch.has_won_batch(np.zeros(shape[:1] + shape[2:], dtype=bool))), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+"""
+A module to time the tic tac toe functions over the fixture positions in tictactoedata, from the command line.
+
+Each position on the ladder, from ONE_FILLED to the recorded games, is timed with has_won_3d, available_spots,
+utility, and a full solve from an empty transposition table. The recorded games count as one position each,
+timed over every one of their frames. Every case is run a few times to warm up, then timed some number of times,
+and the median and 95th percentile of the times are reported.
+
+Results can be written out as JSON, and compared with the JSON of an earlier run to flag the cases that got slower:
+    python tictactoebenchmark.py --output baseline.json
+    python tictactoebenchmark.py --baseline baseline.json
+"""
+
+# Use this to read the command line.
+import argparse
+from collections import namedtuple
+# Use this to read and write results.
+import json
+import platform
+import sys
+# Use this to time cases.
+import time
+import tictactoe
+import tictactoesearch
+import tictactoedata as data
+
+# The names of the fixture positions to time, from fewest marks to most, and then the recorded games.
+LADDER = ('ONE_FILLED', 'TWO_FILLED', 'THREE_FILLED', 'FOUR_FILLED', 'FIVE_FILLED', 'SIX_FILLED', 'SEVEN_FILLED',
+          'RANDOM_INCOMPLETE_MORE_LESSER', 'RANDOM_INCOMPLETE_LESSERV2', 'RANDOM_INCOMPLETE_LESSER',
+          'RANDOM_INCOMPLETE_LESS', 'RANDOM_INCOMPLETE', 'NINE_FROM_FILLED', 'TEN_FROM_FILLED', 'ELEVEN_FROM_FILLED',
+          'OUTSIDE_CENTER', 'GAME_1', 'GAME_2')
+
+# The functions timed on every position.
+FUNCTIONS = ('has_won_3d', 'available_spots', 'utility', 'solve')
+
+# How much slower than the baseline a case's median may get before it's flagged, as a fraction.
+DEFAULT_TOLERANCE = 0.25
+
+# A case to time: its name, a function running it once, a function to call before each timing, or None,
+# and how many times to run it per timing, so fast functions are timed over enough calls for the clock to see them.
+Case = namedtuple('Case', ['name', 'run', 'setup', 'number'])
+
+
+def positions():
+    """
+    Returns the positions on the ladder.
+    :return:    A list of tuples of each position's name and a list of its games.
+    """
+    ladder = []
+    for name in LADDER:
+        value = getattr(data, name)
+        ladder.append((name, value if isinstance(value, list) else [value]))
+    return ladder
+
+
+def _clear_tables():
+    """
+    Empties the tables solve learns from, so every timing solves from scratch.
+    """
+    tictactoesearch.TABLE.clear()
+    tictactoesearch.ORDERING.clear()
+
+
+def position_cases(name, games, number):
+    """
+    Makes the cases for one position.
+    :param name:    The position's name.
+    :param games:   A list of the position's games.
+    :param number:  How many times to run the fast functions per timing.
+    :return:        A list of Cases, one for each of FUNCTIONS.
+    """
+    wrappers = [tictactoesearch.TicTacToeWrapper(game) for game in games]
+    turns = [data.whose_turn(game) for game in games]
+
+    def has_won():
+        for game in games:
+            tictactoe.has_won_3d(game[0])
+            tictactoe.has_won_3d(game[1])
+
+    def available_spots():
+        for game in games:
+            tictactoe.available_spots(game)
+
+    def utility():
+        for wrapper in wrappers:
+            tictactoesearch.utility(wrapper)
+
+    def solve():
+        for wrapper, turn in zip(wrappers, turns):
+            tictactoesearch.solve(wrapper, turn)
+
+    return [Case(name + ' has_won_3d', has_won, None, number),
+            Case(name + ' available_spots', available_spots, None, number),
+            Case(name + ' utility', utility, None, number),
+            Case(name + ' solve', solve, _clear_tables, 1)]
+
+
+def percentile(samples, fraction):
+    """
+    Finds a percentile of some samples by the nearest rank.
+    :param samples:     A non-empty list of numbers.
+    :param fraction:    Between 0 and 1, the fraction of the samples that should be at or below the percentile.
+    :return:            The smallest sample with at least that fraction of the samples at or below it.
+    """
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * fraction // 1))
+    return ordered[int(rank) - 1]
+
+
+def time_case(case, warmup, repeat):
+    """
+    Times a case.
+    :param case:    The Case to time.
+    :param warmup:  How many times to run it untimed first.
+    :param repeat:  How many timings to take.
+    :return:        A list of repeat times in seconds, each for a single run of the case.
+    """
+    samples = []
+    for index in range(warmup + repeat):
+        if case.setup is not None:
+            case.setup()
+        start = time.perf_counter()
+        for _ in range(case.number):
+            case.run()
+        elapsed = time.perf_counter() - start
+        if index >= warmup:
+            samples.append(elapsed / case.number)
+    return samples
+
+
+def run(warmup=1, repeat=10, number=100, match=None):
+    """
+    Times every case on the ladder.
+    :param warmup:  How many times to run each case untimed first.
+    :param repeat:  How many timings to take of each case.
+    :param number:  How many times to run the fast functions per timing.
+    :param match:   Only time the cases with this in their name, or None for every case.
+    :return:        A dictionary of results ready to write as JSON.
+    """
+    results = {}
+    for name, games in positions():
+        for case in position_cases(name, games, number):
+            if match is not None and match not in case.name:
+                continue
+            samples = time_case(case, warmup, repeat)
+            results[case.name] = {'median': percentile(samples, 0.5), 'p95': percentile(samples, 0.95),
+                                  'samples': samples}
+    return {'python': platform.python_version(), 'warmup': warmup, 'repeat': repeat, 'number': number,
+            'results': results}
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares the medians of two runs, case by case.
+    :param current:     The results of the new run, as returned by run.
+    :param baseline:    The results of the old run, as returned by run.
+    :param tolerance:   How much slower a case's median may get before it's flagged, as a fraction.
+    :return:            A list of tuples of the name, the ratio of the new median to the old,
+                        and True if it got too much slower, for every case in both runs.
+    """
+    rows = []
+    for name, result in current['results'].items():
+        old = baseline['results'].get(name)
+        if old is None or not old['median']:
+            continue
+        ratio = result['median'] / old['median']
+        rows.append((name, ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def main(args=None):
+    """
+    Runs the benchmark from the command line.
+    :param args:    A list of command line arguments, or None to read them from sys.argv.
+    :return:        The exit status, 1 if any case got too much slower than the baseline, and 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description='Time the tic tac toe functions over the tictactoedata fixtures.')
+    parser.add_argument('--warmup', type=int, default=1, help='untimed runs of each case first')
+    parser.add_argument('--repeat', type=int, default=10, help='timings to take of each case')
+    parser.add_argument('--number', type=int, default=100, help='runs of the fast functions per timing')
+    parser.add_argument('--match', help='only time the cases with this in their name')
+    parser.add_argument('--output', help='a file to write the results to as JSON')
+    parser.add_argument('--baseline', help='a file of results from an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='how much slower than the baseline a case may get, as a fraction')
+    options = parser.parse_args(args)
+
+    current = run(options.warmup, options.repeat, options.number, options.match)
+    print('{:<45} {:>12} {:>12}'.format('case', 'median (us)', 'p95 (us)'))
+    for name, result in current['results'].items():
+        print('{:<45} {:>12.1f} {:>12.1f}'.format(name, result['median'] * 1e6, result['p95'] * 1e6))
+    if options.output is not None:
+        with open(options.output, 'w') as file:
+            json.dump(current, file, indent=2)
+
+    if options.baseline is None:
+        return 0
+    with open(options.baseline) as file:
+        baseline = json.load(file)
+    rows = compare(current, baseline, options.tolerance)
+    print()
+    print('{:<45} {:>12}'.format('case', 'vs baseline'))
+    for name, ratio, slower in rows:
+        print('{:<45} {:>11.2f}x{}'.format(name, ratio, '  REGRESSION' if slower else ''))
+    return 1 if any(slower for _, _, slower in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
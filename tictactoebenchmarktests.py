@@ -0,0 +1,49 @@
+"""
+A collection of unit-tests for tictactoebenchmark.py.
+"""
+
+import unittest
+# Use this to check results can be written out.
+import json
+# The functions we are testing are from this module.
+import tictactoebenchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    """
+    A test case for the tictactoebenchmark functions.
+    """
+
+    def test_percentile(self):
+        """
+        Percentiles should pick samples by the nearest rank, whatever order they're given in.
+        """
+        samples = [5, 1, 4, 2, 3]
+        self.assertEqual(tictactoebenchmark.percentile(samples, 0.5), 3)
+        self.assertEqual(tictactoebenchmark.percentile(samples, 0.95), 5)
+        self.assertEqual(tictactoebenchmark.percentile(samples, 0), 1)
+        self.assertEqual(tictactoebenchmark.percentile(list(range(1, 101)), 0.95), 95)
+
+    def test_run(self):
+        """
+        A run should time every function on the ladder, and write out as JSON.
+        """
+        current = tictactoebenchmark.run(warmup=0, repeat=2, number=1, match='SEVEN_FILLED')
+        self.assertEqual(sorted(current['results']),
+                         sorted('SEVEN_FILLED ' + function for function in tictactoebenchmark.FUNCTIONS))
+        for result in current['results'].values():
+            self.assertEqual(len(result['samples']), 2)
+            self.assertLessEqual(result['median'], result['p95'])
+        self.assertEqual(json.loads(json.dumps(current)), current)
+
+    def test_compare(self):
+        """
+        Only cases slower than the baseline by more than the tolerance should be flagged.
+        """
+        baseline = {'results': {'a': {'median': 1.0}, 'b': {'median': 1.0}, 'gone': {'median': 1.0}}}
+        current = {'results': {'a': {'median': 1.1}, 'b': {'median': 2.0}, 'new': {'median': 1.0}}}
+        self.assertEqual(tictactoebenchmark.compare(current, baseline, 0.25), [('a', 1.1, False), ('b', 2.0, True)])
+
+
+if __name__ == '__main__':
+    unittest.main()
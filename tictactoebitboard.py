@@ -0,0 +1,196 @@
+"""
+A module representing 3d tic-tac-toe games as bitboards.
+
+A bitboard game is a tuple of two python ints, the first holding the x marks and the second the o marks.
+Bit i of either int is set when that player has a mark in cell i,
+where cells are numbered in the same order numpy flattens a (3, 3, 3) array.
+"""
+
+# Use this to list the coordinates of every cell.
+from itertools import product
+# Use this to convert to and from the array format in tictactoedata.
+import numpy as np
+# Use this for the table of winning lines.
+import tictactoelines
+
+# The number of cells in a cube, and a mask with a bit set for every one of them.
+CELLS = 27
+FULL = (1 << CELLS) - 1
+# The center cell, (1, 1, 1), which possible_actions in tictactoesearch never lets anybody take.
+CENTER = 13
+CENTER_BIT = 1 << CENTER
+PLAYABLE = FULL & ~CENTER_BIT
+
+# The coordinate tuple of every cell, in cell order.
+COORDINATES = tuple(product(range(3), repeat=3))
+
+# The 49 winning lines of the cube as masks of three bits each.
+LINES = tuple(sum(1 << cell for cell in line) for line in tictactoelines.winning_lines(3))
+
+
+def _win_shifts():
+    """
+    Groups the winning lines by the distance between their cells.
+    :return:    A tuple of (step, starting cell mask) pairs, one for each of the 13 directions in a cube.
+    """
+    starts = {}
+    for first, second, _ in tictactoelines.winning_lines(3):
+        starts[second - first] = starts.get(second - first, 0) | (1 << first)
+    return tuple(sorted(starts.items()))
+
+
+# A line starting at cell i with step s is owned when bits i, i + s and i + 2s are all set.
+# Shifting the board down by s and 2s lines those bits up with bit i, so one AND checks every line of a direction.
+_WIN_SHIFTS = _win_shifts()
+
+# The value of each cell's bit, used to pack arrays with a single dot product.
+_CELL_WEIGHTS = np.left_shift(1, np.arange(CELLS, dtype=np.int64))
+
+
+def cell_index(coordinate):
+    """
+    Returns the cell number of a coordinate tuple.
+    :param coordinate:  A (z, y, x) coordinate tuple.
+    :return:            The index of the bit for that cell.
+    """
+    z_coordinate, y_coordinate, x_coordinate = coordinate
+    return 9 * z_coordinate + 3 * y_coordinate + x_coordinate
+
+
+def cell_coordinate(cell):
+    """
+    Returns the coordinate tuple of a cell number.
+    :param cell:    The index of the bit for some cell.
+    :return:        The (z, y, x) coordinate tuple of that cell.
+    """
+    return COORDINATES[cell]
+
+
+def from_array(game):
+    """
+    Packs a 3d-tic-tac-toe structure into a bitboard.
+    :param game:    A (2, 3, 3, 3) boolean array, as defined in tictactoedata.
+    :return:        A tuple of the x bits and the o bits.
+    """
+    x_bits, o_bits = game.reshape(2, CELLS).astype(np.int64) @ _CELL_WEIGHTS
+    return int(x_bits), int(o_bits)
+
+
+def to_array(board):
+    """
+    Unpacks a bitboard into a 3d-tic-tac-toe structure.
+    :param board:   A tuple of the x bits and the o bits.
+    :return:        A (2, 3, 3, 3) boolean array, as defined in tictactoedata.
+    """
+    bits = np.array(board, dtype=np.int64)[:, None]
+    return (np.right_shift(bits, np.arange(CELLS)) & 1).astype(bool).reshape((2, 3, 3, 3))
+
+
+def pack(board):
+    """
+    Packs both players' bits into a single int, cheap to compare, hash, and send between processes.
+    :param board:   A tuple of the x bits and the o bits.
+    :return:        The x bits, with the o bits shifted above them.
+    """
+    x_bits, o_bits = board
+    return x_bits | (o_bits << CELLS)
+
+
+def unpack(key):
+    """
+    Unpacks a key made by pack.
+    :param key:     The x bits, with the o bits shifted above them.
+    :return:        A tuple of the x bits and the o bits.
+    """
+    return key & FULL, key >> CELLS
+
+
+def has_won(bits):
+    """
+    Returns if the marks of a player make three in a row.
+    :param bits:    The bits of one player's marks.
+    :return:        True if there is a 3 in a row.
+    """
+    for step, starts in _WIN_SHIFTS:
+        if bits & (bits >> step) & (bits >> (step << 1)) & starts:
+            return True
+    return False
+
+
+def winning_cells(bits, empty):
+    """
+    Returns the cells where a player could complete a line with one more mark.
+    :param bits:    The bits of one player's marks.
+    :param empty:   A mask of the cells the player is allowed to mark.
+    :return:        A mask of the cells in empty that complete a line.
+    """
+    threats = 0
+    for step, starts in _WIN_SHIFTS:
+        double = step << 1
+        # A line starting at i is missing only its first, middle, or last cell.
+        threats |= ((bits >> step) & (bits >> double) & starts) \
+            | ((bits & (bits >> double) & starts) << step) \
+            | ((bits & (bits >> step) & starts) << double)
+    return threats & empty
+
+
+def game_over(board):
+    """
+    Returns if the game is over.
+    :param board:   A tuple of the x bits and the o bits.
+    :return:        True if the game is won or tied by the two players, False otherwise.
+    """
+    x_bits, o_bits = board
+    return has_won(x_bits) or has_won(o_bits) or (x_bits | o_bits) == FULL
+
+
+def utility(board):
+    """
+    Defines the utility for X of a bitboard, matching tictactoesearch.utility.
+    :param board:   A tuple of the x bits and the o bits.
+    :return:        1 if X has won, -1 if O has won, 0 if tied, and None if the game is not over.
+    """
+    x_bits, o_bits = board
+    if has_won(x_bits):
+        return 1
+    if has_won(o_bits):
+        return -1
+    if (x_bits | o_bits) == FULL:
+        return 0
+    return None
+
+
+def play(board, cell, turn):
+    """
+    Places a mark on a bitboard.
+    :param board:   A tuple of the x bits and the o bits.
+    :param cell:    The cell number to mark.
+    :param turn:    A boolean indicating if it's x's turn (True) or not (False).
+    :return:        A new tuple of the x bits and the o bits.
+    """
+    x_bits, o_bits = board
+    if turn:
+        return x_bits | (1 << cell), o_bits
+    return x_bits, o_bits | (1 << cell)
+
+
+def available_spots(board):
+    """
+    Returns the empty cells of a bitboard, in the same order as tictactoe.available_spots.
+    :param board:   A tuple of the x bits and the o bits.
+    :return:        A list of cell numbers.
+    """
+    x_bits, o_bits = board
+    return list(cells(FULL & ~(x_bits | o_bits)))
+
+
+def cells(mask):
+    """
+    Iterates over the cells set in a mask, lowest cell first.
+    :param mask:    Any bitboard int, like the empty cells of a game.
+    :return:        A generator of cell numbers.
+    """
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
@@ -0,0 +1,99 @@
+"""
+A collection of unit-tests for tictactoebitboard.py.
+"""
+
+import unittest
+# The functions we are checking the bitboards against.
+import tictactoe
+# The functions we are testing are from this module.
+import tictactoebitboard as bitboard
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+# Every 3d example, including every frame of the recorded games.
+EXAMPLES_3D = [value for value in vars(data).values()
+               if hasattr(value, 'shape') and value.shape == (2, 3, 3, 3)] + data.GAME_1 + data.GAME_2
+
+
+class TestConversion(unittest.TestCase):
+    """
+    A test case for the tictactoebitboard.from_array and tictactoebitboard.to_array functions.
+    """
+
+    def test_round_trip(self):
+        """
+        Packing and unpacking an example should give back the same example.
+        """
+        for game in EXAMPLES_3D:
+            self.assertTrue((bitboard.to_array(bitboard.from_array(game)) == game).all())
+
+    def test_cell_order(self):
+        """
+        Cells should be numbered the way numpy flattens the array.
+        """
+        x_bits, o_bits = bitboard.from_array(data.X_TAKEN_CENTER_CENTER_3D)
+        self.assertEqual(x_bits, bitboard.CENTER_BIT)
+        self.assertEqual(o_bits, 0)
+        self.assertEqual(bitboard.cell_index((1, 1, 1)), bitboard.CENTER)
+        self.assertEqual(bitboard.cell_coordinate(bitboard.CENTER), (1, 1, 1))
+
+
+class TestGameFunctions(unittest.TestCase):
+    """
+    A test case comparing the bitboard game functions against tictactoe.
+    """
+
+    def test_lines(self):
+        """
+        There are 49 ways to win in a cube.
+        """
+        self.assertEqual(len(bitboard.LINES), 49)
+        self.assertEqual(len(set(bitboard.LINES)), 49)
+
+    def test_has_won(self):
+        """
+        Bitboards should agree with has_won_3d on every example.
+        """
+        for game in EXAMPLES_3D:
+            x_bits, o_bits = bitboard.from_array(game)
+            self.assertEqual(bitboard.has_won(x_bits), tictactoe.has_won_3d(game[0]))
+            self.assertEqual(bitboard.has_won(o_bits), tictactoe.has_won_3d(game[1]))
+            self.assertEqual(bitboard.game_over((x_bits, o_bits)), tictactoe.game_over_3d(game))
+
+    def test_every_line(self):
+        """
+        Owning any single line wins, and owning any single line minus a cell does not.
+        """
+        for line in bitboard.LINES:
+            self.assertTrue(bitboard.has_won(line))
+            self.assertFalse(bitboard.has_won(line & (line - 1)))
+
+    def test_available_spots(self):
+        """
+        Bitboards should find the same spots as available_spots, in the same order.
+        """
+        for game in EXAMPLES_3D:
+            self.assertEqual(list(map(bitboard.cell_coordinate, bitboard.available_spots(bitboard.from_array(game)))),
+                             tictactoe.available_spots(game))
+
+    def test_cells(self):
+        """
+        Iterating over a mask should give back every cell set in it, lowest first.
+        """
+        self.assertEqual(list(bitboard.cells(0)), [])
+        self.assertEqual(list(bitboard.cells(bitboard.FULL)), list(range(bitboard.CELLS)))
+        self.assertEqual(list(bitboard.cells(bitboard.PLAYABLE)), [cell for cell in range(27) if cell != 13])
+        self.assertEqual(list(bitboard.cells((1 << 26) | (1 << 4) | 1)), [0, 4, 26])
+
+    def test_play(self):
+        """
+        Playing on a bitboard should mark the same cell as marking the array.
+        """
+        game = data.BLANK_GAME_3D.copy()
+        game[1][(0, 2, 1)] = True
+        self.assertEqual(bitboard.play(bitboard.from_array(data.BLANK_GAME_3D), bitboard.cell_index((0, 2, 1)), False),
+                         bitboard.from_array(game))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -30,6 +30,15 @@ def reshape(arr):
     return np.array([arr == X, arr == O], dtype=bool)
 
 
+def whose_turn(game):
+    """
+    Returns whose turn it is in an example, since X always goes first.
+    :param game:    The 2d or 3d tic-tac-toe structure.
+    :return:        True if it's x's turn, which it is whenever x doesn't have more marks than o, False otherwise.
+    """
+    return bool(game[0].sum() <= game[1].sum())
+
+
 # A blank game.
 BLANK_GAME_2D = np.zeros((2, 3, 3), dtype=bool)
 
@@ -0,0 +1,147 @@
+"""
+A module of an on-disk database of solved tic tac toe games, so solves carry over from one run to the next.
+
+The file is a header, then a sorted run of records, then the records added since the run was last sorted.
+Each record is a 64 bit word holding a game's canonical key above a 2 bit value, the value plus one.
+Opening a database maps the file into memory instead of reading it, so looking a game up in the sorted run
+is a binary search that only touches the pages it needs.
+The added records are kept in memory too, so once there are COMPACT_THRESHOLD of them they're sorted into the run,
+which keeps opening a database from reading more than that many records however big it gets.
+"""
+
+# Use these to map the file into memory and read its header.
+import mmap
+import os
+import struct
+import numpy as np
+import tictactoesymmetry
+
+# Where the database is kept unless told otherwise, next to this module.
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tictactoesolved.db')
+
+# The header is a magic string to recognise the file by, then how many records are in the sorted run.
+_MAGIC = b'TTTSOLV1'
+_HEADER = struct.Struct('<8sQ')
+_RECORD = struct.Struct('<Q')
+_DTYPE = np.dtype('<u8')
+_VALUE_BITS = 2
+
+# How many records may be added after the sorted run before they're sorted into it.
+COMPACT_THRESHOLD = 4096
+
+
+class SolvedDatabase:
+    """
+    A file of solved games, from the canonical key of the marks of the player to move and the other player,
+    to the value of the game for the player to move.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        """
+        Opens a database, making an empty one if the file doesn't exist yet.
+        :param path:    The file the database is kept in.
+        """
+        self.path = path
+        if not os.path.exists(path) or not os.path.getsize(path):
+            with open(path, 'wb') as file:
+                file.write(_HEADER.pack(_MAGIC, 0))
+        self._open()
+
+    def _open(self):
+        """
+        Maps the file into memory, and reads in the records added since it was last sorted.
+        """
+        with open(self.path, 'r+b') as file:
+            header = file.read(_HEADER.size)
+            if len(header) < _HEADER.size or header[:len(_MAGIC)] != _MAGIC:
+                raise ValueError('{} is not a solved game database'.format(self.path))
+            # A record cut short by a crash mid-write is cut off, so the next record added starts on a whole word.
+            size = os.fstat(file.fileno()).st_size
+            whole = size - (size - _HEADER.size) % _DTYPE.itemsize
+            if size > whole:
+                file.truncate(whole)
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        _, sorted_count = _HEADER.unpack_from(self._map)
+        count = (len(self._map) - _HEADER.size) // _DTYPE.itemsize
+        records = np.frombuffer(self._map, dtype=_DTYPE, count=count, offset=_HEADER.size)
+        self._sorted = records[:sorted_count]
+        self._added = {record >> _VALUE_BITS: (record & 3) - 1 for record in records[sorted_count:].tolist()}
+        self._appender = open(self.path, 'ab')
+        if len(self._added) >= COMPACT_THRESHOLD:
+            self.compact()
+
+    def close(self):
+        """
+        Closes the file. The database can't be used afterwards.
+        """
+        self._appender.close()
+        # The map can only be closed once nothing is looking into it.
+        self._sorted = None
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self):
+        return len(self._sorted) + len(self._added)
+
+    def get(self, key):
+        """
+        Looks up the value of a game by its canonical key.
+        :param key: The canonical key from tictactoesymmetry.canonical_key.
+        :return:    1 for a win, 0 for a tie, and -1 for a loss, for the player to move, or None if it isn't solved.
+        """
+        value = self._added.get(key)
+        if value is not None:
+            return value
+        index = int(np.searchsorted(self._sorted, key << _VALUE_BITS))
+        if index < len(self._sorted):
+            record = int(self._sorted[index])
+            if record >> _VALUE_BITS == key:
+                return (record & 3) - 1
+        return None
+
+    def lookup(self, mine, theirs):
+        """
+        Looks up the value of a game.
+        :param mine:    The bits of the marks of the player to move.
+        :param theirs:  The bits of the marks of the other player.
+        :return:        1 for a win, 0 for a tie, and -1 for a loss, for the player to move, or None if it isn't solved.
+        """
+        key, _ = tictactoesymmetry.canonical_key(mine, theirs)
+        return self.get(key)
+
+    def add(self, mine, theirs, value):
+        """
+        Adds the value of a game to the end of the file, unless it's already there.
+        :param mine:    The bits of the marks of the player to move.
+        :param theirs:  The bits of the marks of the other player.
+        :param value:   1 for a win, 0 for a tie, and -1 for a loss, for the player to move.
+        """
+        key, _ = tictactoesymmetry.canonical_key(mine, theirs)
+        if self.get(key) is not None:
+            return
+        self._added[key] = value
+        self._appender.write(_RECORD.pack(key << _VALUE_BITS | (value + 1)))
+        self._appender.flush()
+        if len(self._added) >= COMPACT_THRESHOLD:
+            self.compact()
+
+    def compact(self):
+        """
+        Sorts the records added since the last compaction into the sorted run, so looking them up needs no memory.
+        The file is rewritten beside the old one and swapped in, so a crash part way through loses nothing.
+        """
+        added = np.array(sorted(key << _VALUE_BITS | (value + 1) for key, value in self._added.items()), dtype=_DTYPE)
+        records = np.concatenate((self._sorted, added))
+        records.sort()
+        self.close()
+        temporary = self.path + '.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, len(records)))
+            file.write(records.tobytes())
+        os.replace(temporary, self.path)
+        self._open()
@@ -0,0 +1,160 @@
+"""
+A collection of unit-tests for tictactoedatabase.py.
+"""
+
+import os
+import tempfile
+import unittest
+# The class we are testing is from this module.
+import tictactoedatabase
+from tictactoedatabase import SolvedDatabase
+# The searches the database remembers the values of.
+import tictactoebitboard
+import tictactoesearch
+from tictactoestats import SearchStats
+import tictactoesymmetry
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+
+class TestSolvedDatabase(unittest.TestCase):
+    """
+    A test case for the tictactoedatabase.SolvedDatabase class.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'solved.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_empty(self):
+        """
+        A new database should be empty, and stay empty when opened again.
+        """
+        with SolvedDatabase(self.path) as database:
+            self.assertEqual(len(database), 0)
+            self.assertIsNone(database.lookup(0, 1))
+        with SolvedDatabase(self.path) as database:
+            self.assertEqual(len(database), 0)
+
+    def test_persists(self):
+        """
+        Values added should be found again after reopening and after compacting, including for symmetric games.
+        """
+        with SolvedDatabase(self.path) as database:
+            database.add(0, 1, -1)
+            database.add(1, 2, 0)
+            database.add(1 << 2, 1, 1)
+        for compact in (False, True):
+            with SolvedDatabase(self.path) as database:
+                self.assertEqual(len(database), 3)
+                self.assertEqual(database.lookup(0, 1), -1)
+                # The far corner is the same game as the first corner, turned around.
+                self.assertEqual(database.lookup(0, 1 << 26), -1)
+                self.assertEqual(database.lookup(1, 2), 0)
+                self.assertEqual(database.lookup(1 << 2, 1), 1)
+                self.assertIsNone(database.lookup(2, 1))
+                if compact:
+                    database.compact()
+                    self.assertEqual(database.get(tictactoesymmetry.canonical_key(1, 2)[0]), 0)
+
+    def test_torn_record(self):
+        """
+        A record cut short should be dropped, and records added after it should still be found.
+        """
+        with SolvedDatabase(self.path) as database:
+            database.add(0, 1, -1)
+        with open(self.path, 'ab') as file:
+            file.write(b'\x01\x02\x03')
+        with SolvedDatabase(self.path) as database:
+            self.assertEqual(len(database), 1)
+            database.add(1, 2, 0)
+        self.assertEqual((os.path.getsize(self.path) - 16) % 8, 0)
+        with SolvedDatabase(self.path) as database:
+            self.assertEqual(len(database), 2)
+            self.assertEqual(database.lookup(0, 1), -1)
+            self.assertEqual(database.lookup(1, 2), 0)
+
+    def test_compacts_itself(self):
+        """
+        Adding COMPACT_THRESHOLD records should sort them into the run, so none are left to read in on opening.
+        """
+        threshold = tictactoedatabase.COMPACT_THRESHOLD
+        tictactoedatabase.COMPACT_THRESHOLD = 3
+        try:
+            # Games with different numbers of marks can't be symmetric to each other.
+            with SolvedDatabase(self.path) as database:
+                for marks in range(1, 4):
+                    database.add((1 << marks) - 1, 0, 1)
+                self.assertEqual(len(database._added), 0)
+                database.add(15, 0, 1)
+            with SolvedDatabase(self.path) as database:
+                self.assertEqual(len(database), 4)
+                self.assertEqual(len(database._added), 1)
+                self.assertEqual(database.lookup(7, 0), 1)
+        finally:
+            tictactoedatabase.COMPACT_THRESHOLD = threshold
+
+    def test_not_a_database(self):
+        """
+        Opening some other file should fail rather than read garbage.
+        """
+        with open(self.path, 'wb') as file:
+            file.write(b'not a database at all')
+        with self.assertRaises(ValueError):
+            SolvedDatabase(self.path)
+
+    def test_alpha_beta_value(self):
+        """
+        Alpha-beta should give the same values with a database, and fill it in with the games proven inside the search,
+        not just the games asked about.
+        """
+        with SolvedDatabase(self.path) as database:
+            for game in (data.OUTSIDE_CENTER, data.THREE_FILLED, data.SIX_FILLED):
+                wrapper = tictactoesearch.TicTacToeWrapper(game)
+                for turn in (True, False):
+                    expected = tictactoesearch.alpha_beta_value(wrapper, turn)
+                    tictactoesearch.TABLE.clear()
+                    self.assertEqual(tictactoesearch.alpha_beta_value(wrapper, turn, database), expected)
+                    self.assertEqual(tictactoesearch.alpha_beta_value(wrapper, turn, database), expected)
+            self.assertGreater(len(database), 6)
+            # The replies to the first game are proven inside the search, and have the values searching them gives.
+            x_bits, o_bits = tictactoebitboard.from_array(data.OUTSIDE_CENTER)
+            found = False
+            for cell in tictactoebitboard.cells(tictactoebitboard.PLAYABLE & ~(x_bits | o_bits)):
+                mine, theirs = o_bits, x_bits | (1 << cell)
+                value = database.lookup(mine, theirs)
+                if value is not None:
+                    self.assertEqual(value, tictactoesearch.negamax(mine, theirs, -1, 1))
+                    found = True
+            self.assertTrue(found)
+
+    def test_solve(self):
+        """
+        Solving with a database should give the same value and a line of best play, and solving again from a cold
+        table should mostly read the database rather than search.
+        """
+        wrapper = tictactoesearch.TicTacToeWrapper(data.OUTSIDE_CENTER)
+        with SolvedDatabase(self.path) as database:
+            tictactoesearch.TABLE.clear()
+            cold = SearchStats()
+            expected = tictactoesearch.solve(wrapper, False, cold, database)
+            tictactoesearch.TABLE.clear()
+            warm = SearchStats()
+            result = tictactoesearch.solve(wrapper, False, warm, database)
+        tictactoesearch.TABLE.clear()
+        self.assertEqual(expected.value, tictactoesearch.solve(wrapper, False).value)
+        self.assertEqual(result.value, expected.value)
+        self.assertLess(warm.nodes, cold.nodes)
+        played, turn = wrapper, False
+        for action in result.pv:
+            self.assertEqual(tictactoesearch.alpha_beta_value(played, turn), result.value)
+            played = tictactoesearch.play(played, action, turn)
+            turn = not turn
+        self.assertEqual(tictactoesearch.utility(played), result.value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+"""
+A module to pick a move in tic tac toe within a time budget, by iterative deepening.
+
+Each iteration runs a depth-limited negamax one ply deeper than the last, starting with the best move found so far.
+All iterations share a transposition table, so each one mostly replays the work of the last before going further.
+When time runs out, the move from the deepest finished iteration is returned.
+Games cut off at the depth limit score 0 unless an evaluate function, like tictactoeheuristic.evaluate, is given.
+"""
+
+# Use this to keep to the time budget.
+import time
+from collections import namedtuple
+import tictactoebitboard
+import tictactoesearch
+from tictactoeordering import MoveOrdering
+import tictactoesymmetry
+from tictactoetable import TranspositionTable, EXACT, LOWER, UPPER
+
+# The score of a won game for the player to move.
+# Games cut off at the depth limit score strictly between -WIN and WIN.
+WIN = 10000
+
+# Entries stored at this depth are good for any depth, since their subtree was searched to the end.
+_PROVEN_DEPTH = 63
+
+# How many nodes to search between looks at the clock.
+_CLOCK_INTERVAL = 256
+
+# Entries found by iterative deepening, kept between calls so asking again after each move is cheap.
+# Call TABLE.clear() or TABLE.resize(memory) to free it up or change its budget.
+TABLE = TranspositionTable()
+
+# The killer and history tables learned by iterative deepening, kept between iterations and calls like TABLE.
+ORDERING = MoveOrdering()
+
+# The answer of an iterative deepening search.
+# The action is a coordinate tuple, and the value is for X like min_max_value.
+# A proven value is exact, -1, 0, or 1; otherwise it's a guess between -1 and 1 from the depth limit.
+DeepeningResult = namedtuple('DeepeningResult', ['action', 'value', 'proven', 'depth', 'nodes'])
+
+
+class _OutOfTime(Exception):
+    """
+    Raised inside a search when its time budget has run out.
+    """
+
+
+class _DepthLimitedSearch:
+    """
+    A negamax search cut off at a depth limit, which gives up when it runs past a deadline.
+    """
+
+    def __init__(self, table, deadline, evaluate=None, ordering=None, stats=None):
+        """
+        :param table:       The TranspositionTable to share between iterations.
+        :param deadline:    The time.perf_counter() reading to give up at, or None to never give up.
+        :param evaluate:    A function scoring a game cut off at the depth limit for the player to move,
+                            from the bits of both players' marks to an int strictly between -WIN and WIN,
+                            or None to score them all 0.
+        :param ordering:    The MoveOrdering to order actions with and teach, or None for a fresh one.
+        :param stats:       A tictactoestats.SearchStats to count the search's work in, or None.
+        """
+        self.table = table
+        self.deadline = deadline
+        self.evaluate = evaluate
+        self.ordering = MoveOrdering() if ordering is None else ordering
+        self.stats = stats
+        self.nodes = 0
+
+    def search(self, mine, theirs, depth, alpha, beta):
+        """
+        Finds the score of a game for the player to move, looking no more than depth moves ahead.
+        The game is assumed not to be over, and a player with no actions loses.
+        :param mine:    The bits of the marks of the player to move.
+        :param theirs:  The bits of the marks of the other player.
+        :param depth:   How many more moves to look ahead.
+        :param alpha:   A score the player to move is already guaranteed elsewhere.
+        :param beta:    A score the other player is already guaranteed elsewhere.
+        :return:        WIN, -WIN, or a score in between, fail-soft like tictactoesearch.negamax.
+        """
+        self.nodes += 1
+        if self.deadline is not None and not self.nodes % _CLOCK_INTERVAL and time.perf_counter() > self.deadline:
+            raise _OutOfTime()
+        if self.stats is not None:
+            self.stats.node(bin(mine | theirs).count('1'))
+
+        key, _ = tictactoesymmetry.canonical_key(mine, theirs)
+        entry = self.table.probe(key)
+        if entry is not None and entry[2] >= depth:
+            value, bound, _ = entry
+            if bound == EXACT or (bound == LOWER and value >= beta) or (bound == UPPER and value <= alpha):
+                return value
+            if bound == LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+
+        value, actions = tictactoesearch.forced_actions(mine, theirs)
+        if value is not None:
+            if self.stats is not None:
+                self.stats.terminal()
+            self.table.store(key, value * WIN, EXACT, _PROVEN_DEPTH)
+            return value * WIN
+        if depth == 0:
+            return 0 if self.evaluate is None else self.evaluate(mine, theirs)
+
+        window_alpha = alpha
+        best = -WIN
+        for cell in self.ordering.order(mine, theirs, actions, tactical=False):
+            value = -self.search(theirs, mine | (1 << cell), depth - 1, -beta, -alpha)
+            if value > best:
+                best = value
+                alpha = max(alpha, best)
+                if alpha >= beta:
+                    self.ordering.cutoff(mine, theirs, cell, depth)
+                    if self.stats is not None:
+                        self.stats.cutoff()
+                    break
+
+        # Wins and losses hold at any depth, and so does anything searched all the way to the end of the game.
+        remaining = bin(~(mine | theirs) & tictactoebitboard.PLAYABLE).count('1')
+        stored_depth = _PROVEN_DEPTH if depth >= remaining or abs(best) == WIN else depth
+        if best <= window_alpha:
+            self.table.store(key, best, UPPER, stored_depth)
+        elif best >= beta:
+            self.table.store(key, best, LOWER, stored_depth)
+        else:
+            self.table.store(key, best, EXACT, stored_depth)
+        return best
+
+
+def iterative_deepening(wrapper, turn, budget, table=TABLE, evaluate=None, ordering=ORDERING, stats=None):
+    """
+    Finds the best action it can for the player to move within a time budget.
+    :param wrapper:     The TicTacToeWrapper to pick an action in. The game should not be over.
+    :param turn:        A boolean indicating if it's x's turn (True) or not (False).
+    :param budget:      How many seconds to search for. The first iteration always finishes, however long it takes.
+    :param table:       The TranspositionTable to keep entries in between iterations.
+                        Scores from different evaluate functions shouldn't share a table.
+    :param evaluate:    A function scoring games cut off at the depth limit, as taken by _DepthLimitedSearch.
+    :param ordering:    The MoveOrdering to order actions with, learning from every iteration.
+    :param stats:       A tictactoestats.SearchStats to count the work of every iteration in, or None.
+    :return:            A DeepeningResult for the deepest iteration that finished.
+                        The action is None if the player to move has no actions.
+    """
+    x_bits, o_bits = tictactoebitboard.unpack(wrapper.key)
+    mine, theirs = (x_bits, o_bits) if turn else (o_bits, x_bits)
+    actions = ordering.order(mine, theirs, ~(mine | theirs) & tictactoebitboard.PLAYABLE)
+    if not actions:
+        return DeepeningResult(None, -1 if turn else 1, True, 0, 0)
+
+    search = _DepthLimitedSearch(table, None, evaluate, ordering, stats)
+    deadline = time.perf_counter() + budget
+    result = None
+    if stats is not None:
+        stats.start(table)
+    for depth in range(1, len(actions) + 1):
+        try:
+            best, score = _search_root(search, mine, theirs, actions, depth - 1)
+        except _OutOfTime:
+            break
+        # Searching as deep as there are actions left, or finding a win or a loss, proves the score.
+        proven = depth == len(actions) or abs(score) == WIN
+        value = (score > 0) - (score < 0) if proven else score / WIN
+        result = DeepeningResult(tictactoebitboard.cell_coordinate(best), value if turn else -value, proven, depth,
+                                 search.nodes)
+        if proven:
+            break
+        # The best action goes first next time, so the deeper search has a good score to cut off against right away.
+        actions.remove(best)
+        actions.insert(0, best)
+        search.deadline = deadline
+    if stats is not None:
+        stats.stop()
+    return result
+
+
+def depth_limited_value(wrapper, turn, depth, evaluate=None, table=None):
+    """
+    Finds the value of a game looking no more than some number of moves ahead, like a cut off min_max_value.
+    :param wrapper:     The TicTacToeWrapper to evaluate with a value.
+    :param turn:        A boolean indicating if it's x's turn (True) or not (False).
+    :param depth:       How many moves to look ahead.
+    :param evaluate:    A function scoring games cut off at the depth limit, as taken by _DepthLimitedSearch.
+    :param table:       The TranspositionTable to use, or None for a fresh one just for this search.
+    :return:            The value for x, -1, 0, or 1 if the game was searched to the end,
+                        or a score strictly between -1 and 1 if it was cut off.
+    """
+    game_state_utility = tictactoesearch.utility(wrapper)
+    if game_state_utility is not None:
+        return game_state_utility
+    x_bits, o_bits = tictactoebitboard.unpack(wrapper.key)
+    mine, theirs = (x_bits, o_bits) if turn else (o_bits, x_bits)
+    search = _DepthLimitedSearch(TranspositionTable(1 << 20) if table is None else table, None, evaluate)
+    score = search.search(mine, theirs, depth, -WIN, WIN)
+    value = (score > 0) - (score < 0) if abs(score) == WIN else score / WIN
+    return value if turn else -value
+
+
+def _search_root(search, mine, theirs, actions, depth):
+    """
+    Scores every action at the root of an iterative deepening search.
+    :param search:  The _DepthLimitedSearch to search with.
+    :param mine:    The bits of the marks of the player to move.
+    :param theirs:  The bits of the marks of the other player.
+    :param actions: The cell numbers of the actions to consider, best guess first.
+    :param depth:   How many more moves to look ahead after each action.
+    :return:        A tuple of the best action's cell number and its score.
+    """
+    best, best_score = actions[0], -WIN - 1
+    for cell in actions:
+        if tictactoebitboard.winning_cells(mine, 1 << cell):
+            return cell, WIN
+        new_mine = mine | (1 << cell)
+        score = -search.search(theirs, new_mine, depth, -WIN, -best_score)
+        if score > best_score:
+            best, best_score = cell, score
+            if best_score == WIN:
+                break
+    return best, best_score
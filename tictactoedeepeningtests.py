@@ -0,0 +1,44 @@
+"""
+A collection of unit-tests for tictactoedeepening.py.
+"""
+
+import unittest
+# The functions we are testing are from these modules.
+import tictactoedeepening
+import tictactoesearch
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+
+class TestIterativeDeepening(unittest.TestCase):
+    """
+    A test case for the tictactoedeepening.iterative_deepening function.
+    """
+
+    def test_proven_values(self):
+        """
+        Given plenty of time, iterative deepening should prove the same values as alpha-beta with moves that keep them.
+        """
+        for game in (data.BLANK_GAME_3D, data.OUTSIDE_CENTER, data.THREE_FILLED, data.SIX_FILLED, data.GAME_1[6]):
+            wrapper = tictactoesearch.TicTacToeWrapper(game)
+            turn = data.whose_turn(game)
+            result = tictactoedeepening.iterative_deepening(wrapper, turn, 60)
+            self.assertTrue(result.proven)
+            self.assertEqual(result.value, tictactoesearch.alpha_beta_value(wrapper, turn))
+            self.assertIn(result.action, tictactoesearch.possible_actions(wrapper))
+            successor = tictactoesearch.play(wrapper, result.action, turn)
+            self.assertEqual(tictactoesearch.alpha_beta_value(successor, not turn), result.value)
+
+    def test_no_time(self):
+        """
+        Without any time, iterative deepening should still finish its first iteration and give an action.
+        """
+        tictactoedeepening.TABLE.clear()
+        wrapper = tictactoesearch.TicTacToeWrapper(data.BLANK_GAME_3D)
+        result = tictactoedeepening.iterative_deepening(wrapper, True, 0)
+        self.assertGreaterEqual(result.depth, 1)
+        self.assertIn(result.action, tictactoesearch.possible_actions(wrapper))
+
+
+if __name__ == '__main__':
+    unittest.main()
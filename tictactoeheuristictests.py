@@ -0,0 +1,90 @@
+"""
+A collection of unit-tests for tictactoeheuristic.py, and the depth-limited search it plugs into.
+"""
+
+import unittest
+# Use this to build stacks of games.
+import numpy as np
+# The functions we are testing are from these modules.
+import tictactoeheuristic
+import tictactoedeepening
+import tictactoebitboard
+import tictactoesearch
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+# Every 3d example, including every frame of the recorded games.
+EXAMPLES_3D = [value for value in vars(data).values()
+               if hasattr(value, 'shape') and value.shape == (2, 3, 3, 3)] + data.GAME_1 + data.GAME_2
+
+
+class TestEvaluate(unittest.TestCase):
+    """
+    A test case for the tictactoeheuristic.evaluate and tictactoeheuristic.evaluate_batch functions.
+    """
+
+    def test_open_lines(self):
+        """
+        A blank board is even, and a lone corner opens 7 lines with one mark in a cube, and 3 on a board.
+        """
+        self.assertEqual(tictactoeheuristic.evaluate_batch(data.BLANK_GAME_3D[np.newaxis]).tolist(), [0])
+        corner = data.BLANK_GAME_3D.copy()
+        corner[0][0, 0, 0] = True
+        self.assertEqual(tictactoeheuristic.evaluate_batch(corner[np.newaxis]).tolist(),
+                         [7 * tictactoeheuristic.ONE_MARK])
+        corner_2d = data.BLANK_GAME_2D.copy()
+        corner_2d[0][0, 0] = True
+        self.assertEqual(tictactoeheuristic.evaluate_batch(corner_2d[np.newaxis]).tolist(),
+                         [3 * tictactoeheuristic.ONE_MARK])
+
+    def test_matches_batch(self):
+        """
+        Scoring one bitboard for the player to move should match scoring it in a batch for x, and flip for o.
+        """
+        games = np.stack(EXAMPLES_3D)
+        scores = tictactoeheuristic.evaluate_batch(games)
+        swapped = tictactoeheuristic.evaluate_batch(games[:, ::-1])
+        self.assertTrue((scores == -swapped).all())
+        for game, score in zip(EXAMPLES_3D, scores):
+            x_bits, o_bits = tictactoebitboard.from_array(game)
+            self.assertEqual(tictactoeheuristic.evaluate(x_bits, o_bits), score)
+            self.assertEqual(tictactoeheuristic.evaluate(o_bits, x_bits), -score)
+            self.assertLess(abs(score), tictactoedeepening.WIN)
+
+    def test_empty(self):
+        """
+        An empty stack of games should score to an empty array.
+        """
+        for shape in ((0, 2, 3, 3), (0, 2, 3, 3, 3)):
+            self.assertEqual(len(tictactoeheuristic.evaluate_batch(np.zeros(shape, dtype=bool))), 0)
+
+
+class TestDepthLimitedValue(unittest.TestCase):
+    """
+    A test case for the tictactoedeepening.depth_limited_value function.
+    """
+
+    def test_deep_enough(self):
+        """
+        Searching as deep as the game goes should find the exact value, with or without a heuristic.
+        """
+        for game in (data.BLANK_GAME_3D, data.OUTSIDE_CENTER, data.THREE_FILLED, data.SEVEN_FILLED):
+            wrapper = tictactoesearch.TicTacToeWrapper(game)
+            for turn in (True, False):
+                expected = tictactoesearch.alpha_beta_value(wrapper, turn)
+                self.assertEqual(tictactoedeepening.depth_limited_value(wrapper, turn, 26), expected)
+                self.assertEqual(tictactoedeepening.depth_limited_value(wrapper, turn, 26, tictactoeheuristic.evaluate),
+                                 expected)
+
+    def test_cut_off(self):
+        """
+        A shallow search of an unsettled game should give a score strictly between -1 and 1.
+        """
+        wrapper = tictactoesearch.TicTacToeWrapper(data.BLANK_GAME_3D)
+        value = tictactoedeepening.depth_limited_value(wrapper, True, 1, tictactoeheuristic.evaluate)
+        self.assertGreater(value, 0)
+        self.assertLess(value, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
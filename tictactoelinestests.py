@@ -0,0 +1,69 @@
+"""
+A collection of unit-tests for tictactoelines.py.
+"""
+
+import unittest
+# The functions we are checking the line counts against.
+import tictactoe
+# The functions we are testing are from this module.
+import tictactoelines
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+
+class TestWinningLines(unittest.TestCase):
+    """
+    A test case for the tictactoelines.winning_lines function.
+    """
+
+    def test_line_counts(self):
+        """
+        A square has 8 lines, and a cube has 49.
+        """
+        self.assertEqual(len(tictactoelines.winning_lines(2)), 8)
+        self.assertEqual(len(tictactoelines.winning_lines(3)), 49)
+
+    def test_lines_are_wins(self):
+        """
+        Marking any line on a blank board should win it.
+        """
+        for line in tictactoelines.winning_lines(3):
+            box = data.BLANK_GAME_3D[0].copy()
+            box.flat[list(line)] = True
+            self.assertTrue(tictactoe.has_won_3d(box))
+
+
+class TestPlace(unittest.TestCase):
+    """
+    A test case for the tictactoelines.place function.
+    """
+
+    def test_recorded_games(self):
+        """
+        Placing the moves of a recorded game one at a time should keep the counts of the recorded frames.
+        """
+        for game in (data.GAME_1, data.GAME_2):
+            counts = tictactoelines.line_counts(game[0])
+            for before, after in zip(game, game[1:]):
+                player, cell = [(player, cell) for player in range(2) for cell in range(27)
+                                if after[player].flat[cell] and not before[player].flat[cell]][0]
+                counts, completed = tictactoelines.place(counts, cell, player)
+                self.assertEqual(counts, tictactoelines.line_counts(after))
+                self.assertEqual(completed, tictactoe.has_won_3d(after[player]))
+
+    def test_completing_a_line(self):
+        """
+        The last mark of a line should be reported as completing it, and the counts passed in left alone.
+        """
+        counts = tictactoelines.line_counts(data.X_WON_3D_XYZ)
+        self.assertTrue(tictactoelines.has_won(counts, 0))
+        self.assertFalse(tictactoelines.has_won(counts, 1))
+        blank = tictactoelines.line_counts(data.BLANK_GAME_3D)
+        counts, completed = tictactoelines.place(blank, 13, 1)
+        self.assertFalse(completed)
+        self.assertEqual(sum(counts[1]), 13)
+        self.assertEqual(sum(blank[1]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+A module to pick moves in tic tac toe by Monte Carlo tree search, for games too big to solve exactly.
+
+Each iteration walks down the tree picking the child with the best upper confidence bound (UCT),
+adds one new child, plays the game out at random from there, and passes the result back up.
+The tree is kept between moves, so asking about the game after a move reuses everything already searched below it.
+Games go through the same TicTacToeWrapper, play, and utility as tictactoesearch.
+By default the center of the cube is never played, like in possible_actions, but the search can be given any cells
+to play, such as every cell, for games where the center is allowed and the exact searches don't apply.
+A new game can be played out several times at once by tictactoerollout, scoring it by the average result.
+"""
+
+import math
+import random
+# Use this to keep to a budget in milliseconds.
+import time
+import numpy as np
+import tictactoebitboard
+import tictactoerollout
+import tictactoesearch
+
+# The exploration constant UCT is usually given, the square root of two.
+DEFAULT_EXPLORATION = math.sqrt(2)
+
+
+class _Node:
+    """
+    A game in the search tree, with the results of every playout that went through it.
+    """
+
+    __slots__ = ('wrapper', 'turn', 'action', 'parent', 'children', 'untried', 'visits', 'total', 'terminal')
+
+    def __init__(self, wrapper, turn, playable, action=None, parent=None):
+        """
+        :param wrapper:     The TicTacToeWrapper of the game.
+        :param turn:        A boolean indicating if it's x's turn (True) or not (False).
+        :param playable:    A bitboard mask of the cells that can be played.
+        :param action:      The coordinate tuple played to get here from the parent, or None at the root.
+        :param parent:      The _Node this game was played from, or None at the root.
+        """
+        self.wrapper = wrapper
+        self.turn = turn
+        self.action = action
+        self.parent = parent
+        self.children = []
+        self.visits = 0
+        # The sum of the results of every playout through here, for the player who moved into this game.
+        self.total = 0.0
+        # The value of the game for x if it's over, like min_max_value, or None if it's still going.
+        self.terminal = tictactoesearch.utility(wrapper)
+        self.untried = [] if self.terminal is not None else [tictactoebitboard.COORDINATES[cell] for cell in
+                                                             tictactoebitboard.cells(wrapper.empty & playable)]
+        if self.terminal is None and not self.untried:
+            # A player with no actions loses.
+            self.terminal = -1 if turn else 1
+
+
+class MonteCarloTreeSearch:
+    """
+    A tree of searched games, rooted at the game whose move is being picked.
+    """
+
+    def __init__(self, wrapper, turn, exploration=DEFAULT_EXPLORATION, seed=None, playouts=1,
+                 playable=tictactoebitboard.PLAYABLE):
+        """
+        Starts a tree with just the root game.
+        :param wrapper:     The TicTacToeWrapper to pick moves in.
+        :param turn:        A boolean indicating if it's x's turn (True) or not (False).
+        :param exploration: How much UCT favors children with few visits over children with good results.
+        :param seed:        A seed for the random playouts, or None for a different search each time.
+        :param playouts:    How many random games to play from each new game, more than one playing them as a batch.
+        :param playable:    A bitboard mask of the cells the tree and the playouts can play,
+                            every cell but the center unless told otherwise, or tictactoebitboard.FULL for every cell.
+        """
+        self.playable = playable
+        # The same cells as a flat boolean array, for batches of playouts.
+        self._playable_cells = np.array([bool(playable >> cell & 1) for cell in range(tictactoebitboard.CELLS)])
+        self.root = _Node(wrapper, turn, playable)
+        self.exploration = exploration
+        self.random = random.Random(seed)
+        self.playouts = playouts
+        self.rng = np.random.default_rng(seed)
+
+    def search(self, iterations=None, milliseconds=None):
+        """
+        Grows the tree until a budget runs out. At least one budget must be given, and the first to run out stops it.
+        :param iterations:      How many playouts to run, or None for no limit.
+        :param milliseconds:    How long to search for, or None for no limit.
+        :return:                The best action found so far, as by best_action.
+        """
+        if iterations is None and milliseconds is None:
+            raise ValueError('a search needs a budget of iterations or milliseconds')
+        deadline = None if milliseconds is None else time.perf_counter() + milliseconds / 1000
+        done = 0
+        while (iterations is None or done < iterations) and (deadline is None or time.perf_counter() < deadline):
+            self._iterate()
+            done += 1
+        return self.best_action()
+
+    def _iterate(self):
+        """
+        Runs one playout, growing the tree by at most one game.
+        """
+        node = self.root
+        # We walk down through games that have already tried every action.
+        while not node.untried and node.children:
+            node = max(node.children, key=self._uct(node))
+        if node.untried:
+            action = node.untried.pop(self.random.randrange(len(node.untried)))
+            successor = tictactoesearch.play(node.wrapper, action, node.turn)
+            child = _Node(successor, not node.turn, self.playable, action, node)
+            node.children.append(child)
+            node = child
+        if node.terminal is not None:
+            result = node.terminal
+        elif self.playouts > 1:
+            games = np.broadcast_to(node.wrapper.data, (self.playouts,) + node.wrapper.data.shape)
+            outcomes, _ = tictactoerollout.rollout_batch(games, np.full(self.playouts, node.turn), self.rng,
+                                                         self._playable_cells)
+            result = float(outcomes.mean())
+        else:
+            result = self.playout(node.wrapper, node.turn)
+        # Each game on the way back up is scored for the player who moved into it.
+        while node is not None:
+            node.visits += 1
+            node.total += result if not node.turn else -result
+            node = node.parent
+
+    def _uct(self, node):
+        """
+        Makes a function scoring a game's children by their upper confidence bound.
+        :param node:    The _Node whose children are being compared.
+        :return:        A function from a child _Node to its score.
+        """
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+
+        def score(child):
+            return child.total / child.visits + exploration * math.sqrt(log_visits / child.visits)
+        return score
+
+    def playout(self, wrapper, turn):
+        """
+        Plays a game out at random, on bitboards so no arrays are copied.
+        :param wrapper: The TicTacToeWrapper to play out, which should not be over.
+        :param turn:    A boolean indicating if it's x's turn (True) or not (False).
+        :return:        The result for x, 1 for a win, 0 for a tie, and -1 for a loss.
+        """
+        board = list(tictactoebitboard.unpack(wrapper.key))
+        player = 0 if turn else 1
+        while True:
+            taken = board[0] | board[1]
+            actions = list(tictactoebitboard.cells(~taken & self.playable))
+            if not actions:
+                # A player with no actions loses.
+                return -1 if player == 0 else 1
+            board[player] |= 1 << self.random.choice(actions)
+            if tictactoebitboard.has_won(board[player]):
+                return 1 if player == 0 else -1
+            if board[0] | board[1] == tictactoebitboard.FULL:
+                return 0
+            player = 1 - player
+
+    def visit_counts(self):
+        """
+        Returns how many playouts went through each action from the root.
+        :return:    A dictionary from coordinate tuples to visit counts, for every action tried so far.
+        """
+        return {child.action: child.visits for child in self.root.children}
+
+    def best_action(self):
+        """
+        Returns the action from the root with the most visits, which is the one the search trusts the most.
+        :return:    A coordinate tuple, or None if the search hasn't tried any actions.
+        """
+        if not self.root.children:
+            return None
+        return max(self.root.children, key=lambda child: child.visits).action
+
+    def advance(self, action):
+        """
+        Moves the root down past an action, keeping the tree below it and dropping the rest.
+        :param action:  The coordinate tuple played in the root game.
+        """
+        for child in self.root.children:
+            if child.action == action:
+                child.parent = None
+                child.action = None
+                self.root = child
+                return
+        self.root = _Node(tictactoesearch.play(self.root.wrapper, action, self.root.turn), not self.root.turn,
+                          self.playable)
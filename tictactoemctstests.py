@@ -0,0 +1,96 @@
+"""
+A collection of unit-tests for tictactoemcts.py.
+"""
+
+import unittest
+# The class we are testing is from this module.
+from tictactoemcts import MonteCarloTreeSearch
+# Use this to make games and masks of cells to play.
+import tictactoebitboard
+# The exact search the moves are checked with.
+import tictactoesearch
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+
+class TestMonteCarloTreeSearch(unittest.TestCase):
+    """
+    A test case for the tictactoemcts.MonteCarloTreeSearch class.
+    """
+
+    def test_keeps_the_win(self):
+        """
+        In games with a forced win, the search should pick a move that keeps it.
+        """
+        for game, turn in ((data.SIX_FILLED, True), (data.ELEVEN_FROM_FILLED, True), (data.BLANK_GAME_3D, True)):
+            wrapper = tictactoesearch.TicTacToeWrapper(game)
+            action = MonteCarloTreeSearch(wrapper, turn, seed=4100).search(iterations=2000)
+            self.assertIn(action, tictactoesearch.possible_actions(wrapper))
+            self.assertEqual(tictactoesearch.alpha_beta_value(tictactoesearch.play(wrapper, action, turn), not turn), 1)
+
+    def test_batched_playouts(self):
+        """
+        Scoring new games by a batch of playouts should still find a move that keeps the win.
+        """
+        wrapper = tictactoesearch.TicTacToeWrapper(data.SIX_FILLED)
+        action = MonteCarloTreeSearch(wrapper, True, seed=4100, playouts=16).search(iterations=500)
+        self.assertEqual(tictactoesearch.alpha_beta_value(tictactoesearch.play(wrapper, action, True), False), 1)
+
+    def test_visit_counts(self):
+        """
+        Every iteration should visit exactly one action from the root.
+        """
+        tree = MonteCarloTreeSearch(tictactoesearch.TicTacToeWrapper(data.THREE_FILLED), False, seed=1)
+        tree.search(iterations=500)
+        self.assertEqual(sum(tree.visit_counts().values()), 500)
+        self.assertEqual(tree.root.visits, 500)
+        self.assertEqual(max(tree.visit_counts(), key=tree.visit_counts().get), tree.best_action())
+
+    def test_advance_reuses_tree(self):
+        """
+        Advancing past a searched action should keep its subtree, and an unsearched one should start afresh.
+        """
+        tree = MonteCarloTreeSearch(tictactoesearch.TicTacToeWrapper(data.BLANK_GAME_3D), True, seed=2)
+        action = tree.search(iterations=300)
+        visits = tree.visit_counts()[action]
+        tree.advance(action)
+        self.assertEqual(tree.root.visits, visits)
+        self.assertFalse(tree.root.turn)
+        tree.search(milliseconds=20)
+        self.assertGreater(tree.root.visits, visits)
+        fresh = MonteCarloTreeSearch(tictactoesearch.TicTacToeWrapper(data.BLANK_GAME_3D), True)
+        fresh.advance((0, 0, 0))
+        self.assertEqual(fresh.root.visits, 0)
+        self.assertTrue(fresh.root.wrapper.data[0][0, 0, 0])
+
+    def test_center_allowed(self):
+        """
+        Given every cell to play, the tree should try the center of a blank game along with the other 26 cells,
+        and take the center when it wins, with single and batched playouts, after advancing too.
+        """
+        tree = MonteCarloTreeSearch(tictactoesearch.TicTacToeWrapper(data.BLANK_GAME_3D), True, seed=4100,
+                                    playable=tictactoebitboard.FULL)
+        tree.search(iterations=300)
+        self.assertEqual(len(tree.visit_counts()), 27)
+        self.assertIn((1, 1, 1), tree.visit_counts())
+        tree.advance((0, 0, 0))
+        self.assertEqual(len(tree.root.untried) + len(tree.root.children), 26)
+
+        # X has two opposite corners, so the center between them wins.
+        wrapper = tictactoesearch.TicTacToeWrapper(tictactoebitboard.to_array((1 | 1 << 26, 1 << 1 | 1 << 5)))
+        for playouts in (1, 8):
+            tree = MonteCarloTreeSearch(wrapper, True, seed=4100, playouts=playouts, playable=tictactoebitboard.FULL)
+            self.assertEqual(tree.search(iterations=300), (1, 1, 1))
+        self.assertNotEqual(MonteCarloTreeSearch(wrapper, True, seed=4100).search(iterations=300), (1, 1, 1))
+
+    def test_needs_budget(self):
+        """
+        A search without any budget would never end, so it should be refused.
+        """
+        tree = MonteCarloTreeSearch(tictactoesearch.TicTacToeWrapper(data.BLANK_GAME_3D), True)
+        with self.assertRaises(ValueError):
+            tree.search()
+
+
+if __name__ == '__main__':
+    unittest.main()
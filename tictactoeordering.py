@@ -0,0 +1,98 @@
+"""
+A module to put the actions of a game of tic tac toe in a good order for pruning searches.
+
+Alpha-beta only cuts off once it has found a good enough action,
+so the sooner good actions are tried, the less it searches.
+Actions are tried in this order:
+ - actions that win right away, then actions that block the other player from winning right away,
+ - killer actions, which recently cut off the search of another game the same number of moves in,
+ - actions with a good history, which have cut off searches before, weighted by how much searching they saved,
+ - and last, actions on more lines, like corners and the middles of faces in a cube, before actions on fewer.
+"""
+
+import tictactoebitboard
+import tictactoelines
+
+# How many lines go through each cell of a cube. Corners are on 7, edges on 4, face middles on 5, and the center on 13.
+LINE_DEGREE = tuple(len(lines) for lines in tictactoelines.CELL_LINES)
+
+# How many killer actions are kept for each number of moves in.
+KILLERS = 2
+
+# Each kind of reason to try an action first outweighs every reason after it.
+_WIN = 1 << 62
+_BLOCK = 1 << 61
+_KILLER = 1 << 56
+_HISTORY_SHIFT = 5
+
+
+class MoveOrdering:
+    """
+    The killer and history tables learned by a search, and the ordering they give.
+    """
+
+    def __init__(self, history=True, killers=True):
+        """
+        Starts with empty tables.
+        :param history: True to order by the history table.
+        :param killers: True to order killer actions first.
+        """
+        self.use_history = history
+        self.use_killers = killers
+        self.clear()
+
+    def clear(self):
+        """
+        Forgets everything learned.
+        """
+        # A history score for each cell, kept apart for the player moving first and second.
+        self.history = [[0] * tictactoebitboard.CELLS for _ in range(2)]
+        # The latest actions to cut off a search, for each number of moves in, most recent first.
+        self.killers = [[] for _ in range(tictactoebitboard.CELLS + 1)]
+
+    def order(self, mine, theirs, actions, tactical=True):
+        """
+        Puts actions in the order to search them.
+        :param mine:        The bits of the marks of the player to move.
+        :param theirs:      The bits of the marks of the other player.
+        :param actions:     A mask of the cells to order.
+        :param tactical:    True to put wins and blocks first, or False when the caller has already dealt with them.
+        :return:            A list of cell numbers, best first.
+        """
+        ply = bin(mine | theirs).count('1')
+        history = self.history[ply & 1] if self.use_history else None
+        killers = self.killers[ply] if self.use_killers else ()
+        wins = tictactoebitboard.winning_cells(mine, actions) if tactical else 0
+        blocks = tictactoebitboard.winning_cells(theirs, actions) if tactical else 0
+
+        def score(cell):
+            bit = 1 << cell
+            value = LINE_DEGREE[cell]
+            if wins & bit:
+                value += _WIN
+            elif blocks & bit:
+                value += _BLOCK
+            if cell in killers:
+                value += _KILLER >> killers.index(cell)
+            if history is not None:
+                value += history[cell] << _HISTORY_SHIFT
+            return value
+        return sorted(tictactoebitboard.cells(actions), key=score, reverse=True)
+
+    def cutoff(self, mine, theirs, cell, depth):
+        """
+        Learns from an action that cut off a search.
+        :param mine:    The bits of the marks of the player who took the action.
+        :param theirs:  The bits of the marks of the other player.
+        :param cell:    The cell number of the action.
+        :param depth:   How many moves were left to search below the game, so deeper cutoffs count for more.
+        """
+        ply = bin(mine | theirs).count('1')
+        if self.use_history:
+            self.history[ply & 1][cell] += depth * depth
+        if self.use_killers:
+            killers = self.killers[ply]
+            if cell in killers:
+                killers.remove(cell)
+            killers.insert(0, cell)
+            del killers[KILLERS:]
@@ -0,0 +1,109 @@
+"""
+A collection of unit-tests for tictactoeordering.py.
+"""
+
+import unittest
+# The class we are testing is from this module.
+from tictactoeordering import MoveOrdering, LINE_DEGREE
+import tictactoebitboard
+# The search the ordering is for, and the counts of its work.
+import tictactoesearch
+from tictactoestats import SearchStats
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+
+class Unordered:
+    """
+    An ordering that leaves actions in cell order, like possible_actions, and learns nothing.
+    """
+
+    def order(self, mine, theirs, actions, tactical=True):
+        return list(tictactoebitboard.cells(actions))
+
+    def cutoff(self, mine, theirs, cell, depth):
+        pass
+
+    def clear(self):
+        pass
+
+
+class TestMoveOrdering(unittest.TestCase):
+    """
+    A test case for the tictactoeordering.MoveOrdering class.
+    """
+
+    def test_line_degree(self):
+        """
+        Corners are on 7 lines, edges on 4, face middles on 5, and the center on 13.
+        """
+        self.assertEqual(LINE_DEGREE[0], 7)
+        self.assertEqual(LINE_DEGREE[1], 4)
+        self.assertEqual(LINE_DEGREE[4], 5)
+        self.assertEqual(LINE_DEGREE[tictactoebitboard.CENTER], 13)
+        self.assertEqual(sum(LINE_DEGREE), 49 * 3)
+
+    def test_static_order(self):
+        """
+        With nothing learned and nothing to win or block, corners come before face middles, then edges.
+        """
+        order = MoveOrdering().order(0, 0, tictactoebitboard.PLAYABLE)
+        self.assertEqual(sorted(order), list(tictactoebitboard.cells(tictactoebitboard.PLAYABLE)))
+        self.assertEqual([LINE_DEGREE[cell] for cell in order], sorted(map(LINE_DEGREE.__getitem__, order),
+                                                                        reverse=True))
+
+    def test_wins_then_blocks(self):
+        """
+        A win comes first, then a block, whatever their line degrees.
+        """
+        mine = (1 << 3) | (1 << 4)
+        theirs = (1 << 9) | (1 << 10)
+        empty = ~(mine | theirs) & tictactoebitboard.PLAYABLE
+        order = MoveOrdering().order(mine, theirs, empty)
+        self.assertEqual(order[:2], [5, 11])
+        self.assertNotEqual(MoveOrdering().order(mine, theirs, empty, tactical=False)[:2], [5, 11])
+
+    def test_killers_and_history(self):
+        """
+        An action that cut off a search should come first the next time, at the same number of moves in.
+        """
+        ordering = MoveOrdering()
+        ordering.cutoff(1, 2, 7, 10)
+        self.assertEqual(ordering.order(1 << 3, 1 << 5, tictactoebitboard.PLAYABLE & ~0b101000)[0], 7)
+        ordering.clear()
+        self.assertNotEqual(ordering.order(1 << 3, 1 << 5, tictactoebitboard.PLAYABLE & ~0b101000)[0], 7)
+        history_only = MoveOrdering(killers=False)
+        history_only.cutoff(1, 2, 7, 10)
+        self.assertEqual(history_only.order(1 << 3, 1 << 5, tictactoebitboard.PLAYABLE & ~0b101000)[0], 7)
+
+    def test_fewer_nodes(self):
+        """
+        Negamax should find the same values visiting fewer nodes with ORDERING than with actions in cell order,
+        on a game a few moves in and on every example put together, each solved from scratch.
+        """
+        games = [game for game in vars(data).values() if hasattr(game, 'shape') and game.shape == (2, 3, 3, 3)]
+        ordering = tictactoesearch.ORDERING
+        try:
+            counts = []
+            for searched in (Unordered(), MoveOrdering()):
+                tictactoesearch.ORDERING = searched
+                values = []
+                nodes = []
+                for game in [data.THREE_FILLED] + games:
+                    tictactoesearch.TABLE.clear()
+                    searched.clear()
+                    stats = SearchStats()
+                    values.append(tictactoesearch.alpha_beta_value(tictactoesearch.TicTacToeWrapper(game),
+                                                                   data.whose_turn(game), stats=stats))
+                    nodes.append(stats.nodes)
+                counts.append((values, nodes[0], sum(nodes)))
+        finally:
+            tictactoesearch.ORDERING = ordering
+        (unordered_values, unordered_nodes, unordered_total), (values, nodes, total) = counts
+        self.assertEqual(values, unordered_values)
+        self.assertLess(nodes, unordered_nodes)
+        self.assertLess(total, unordered_total)
+
+
+if __name__ == '__main__':
+    unittest.main()
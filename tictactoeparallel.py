@@ -0,0 +1,255 @@
+"""
+A module to solve tic tac toe games on many cores at once, by splitting the search near its root.
+
+Every game one or two moves from the root is solved by its own task in a process pool.
+Games go to the workers as a single packed int, and come back as a single small int, so there's little to pickle.
+Once the value is known, the tasks still waiting to run are cancelled, and the running ones give up at their next node,
+since the pool's generation has moved on from the one they were handed out in.
+So nothing from one call keeps the workers busy into the next, or holds up the pool shutting down.
+The workers all search with one SharedTranspositionTable, so a game reached in two subtrees is only solved once.
+
+solve_many solves a batch of games, like every frame of a recorded game, each only once however often it turns up,
+either in this process or handing one game to each task.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import tictactoebitboard
+import tictactoesearch
+import tictactoesymmetry
+from tictactoetable import SharedTranspositionTable, DEFAULT_MEMORY
+
+
+# The generation of the pool this worker belongs to, shared with the process that made the pool.
+_GENERATION = None
+
+
+def attach_table(name, memory, generation=None):
+    """
+    Makes negamax in this process search with a table shared with other processes.
+    This is run by each worker of a pool made by make_pool as it starts.
+    :param name:        The name of the shared memory of the SharedTranspositionTable.
+    :param memory:      The memory of the SharedTranspositionTable, in bytes.
+    :param generation:  The shared generation of the SolverPool, or None if tasks can't be stopped.
+    """
+    global _GENERATION
+    tictactoesearch.TABLE = SharedTranspositionTable(memory, name)
+    _GENERATION = generation
+
+
+class SolverPool(ProcessPoolExecutor):
+    """
+    A process pool whose workers all search with one shared table, and which can stop the tasks it has handed out.
+    """
+
+    def __init__(self, table, workers=None):
+        """
+        Starts the pool.
+        :param table:   The SharedTranspositionTable for the workers to share.
+        :param workers: How many processes to use, or None for one per core.
+        """
+        # Tasks are handed out with the generation they belong to, and give up once it has moved on.
+        # Only this process writes it, so it needs no lock.
+        self.generation = multiprocessing.RawValue('Q', 0)
+        super().__init__(max_workers=workers, initializer=attach_table,
+                         initargs=(table.name, table.memory(), self.generation))
+
+    def stop(self):
+        """
+        Makes every task handed out so far give up, at its next node if it's running, or as soon as it starts.
+        """
+        self.generation.value += 1
+
+
+def make_pool(table, workers=None):
+    """
+    Starts a process pool whose workers all search with one shared table.
+    :param table:   The SharedTranspositionTable for the workers to share.
+    :param workers: How many processes to use, or None for one per core.
+    :return:        A SolverPool to pass to parallel_value.
+    """
+    return SolverPool(table, workers)
+
+
+def solve_packed(key, generation=None):
+    """
+    Solves a game in a worker process.
+    :param key:         The bits of the player to move, packed below the other player's by tictactoebitboard.pack.
+    :param generation:  The generation of the SolverPool the task was handed out in, or None if it can't be stopped.
+    :return:            1 for a win, 0 for a tie, and -1 for a loss, for the player to move, or None if it was stopped.
+    """
+    if generation is not None:
+        if _GENERATION.value != generation:
+            return None
+        tictactoesearch.STOP = lambda: _check_generation(generation)
+    try:
+        mine, theirs = tictactoebitboard.unpack(key)
+        value, _ = tictactoesearch.forced_actions(mine, theirs)
+        if value is not None:
+            return value
+        return tictactoesearch.negamax(mine, theirs, -1, 1)
+    except tictactoesearch.SearchStopped:
+        return None
+    finally:
+        tictactoesearch.STOP = None
+
+
+def _check_generation(generation):
+    """
+    Gives up on a worker's task once its pool has moved on from the generation it was handed out in.
+    :param generation:  The generation the task was handed out in.
+    """
+    if _GENERATION.value != generation:
+        raise tictactoesearch.SearchStopped()
+
+
+def parallel_value(wrapper, turn, workers=None, split_ply=1, executor=None, memory=DEFAULT_MEMORY):
+    """
+    Finds the same value as min_max_value, splitting the search between worker processes.
+    :param wrapper:     The TicTacToeWrapper to evaluate with a value.
+    :param turn:        A boolean indicating if it's x's turn (True) or not (False).
+    :param workers:     How many processes to use, or None for one per core.
+    :param split_ply:   1 to solve every game after one move in its own task, or 2 to go one move further.
+    :param executor:    A SolverPool from make_pool to reuse, or None to start a process pool for this call.
+    :param memory:      The bytes of the shared table for a pool started for this call.
+    :return:            The end result utility of this wrapped game of tic tac toe after applying min max.
+    """
+    game_state_utility = tictactoesearch.utility(wrapper)
+    if game_state_utility is not None:
+        return game_state_utility
+    x_bits, o_bits = tictactoebitboard.unpack(wrapper.key)
+    mine, theirs = (x_bits, o_bits) if turn else (o_bits, x_bits)
+    if executor is None:
+        table = SharedTranspositionTable(memory)
+        try:
+            # The pool's workers are done with the table by the time it's closed, since every task has been stopped.
+            with make_pool(table, workers) as pool:
+                value = _split_value(mine, theirs, split_ply, pool)
+        finally:
+            table.close()
+            table.unlink()
+    else:
+        value = _split_value(mine, theirs, split_ply, executor)
+    return value if turn else -value
+
+
+def solve_many(positions, workers=1, executor=None, memory=DEFAULT_MEMORY):
+    """
+    Finds the same values as min_max_value for a batch of games, solving games symmetric to each other only once.
+    The deepest games are solved first, so the table already holds the ends of the shallower games when they're solved.
+    :param positions:   An iterable of tuples of a TicTacToeWrapper and whether it's x's turn (True) or not (False).
+    :param workers:     How many processes to use, 1 to solve every game in this process, or None for one per core.
+    :param executor:    An executor from make_pool to reuse, or None to follow workers.
+    :param memory:      The bytes of the shared table for a pool started for this call.
+    :return:            A list of the end result utilities, in the same order as the positions.
+    """
+    values = []
+    # The packed canonical game for the player to move of each game to solve,
+    # mapped to the indices of the positions waiting on it and their turns.
+    waiting = {}
+    for index, (wrapper, turn) in enumerate(positions):
+        values.append(tictactoesearch.utility(wrapper))
+        if values[index] is not None:
+            continue
+        x_bits, o_bits = tictactoebitboard.unpack(wrapper.key)
+        key, _ = tictactoesymmetry.canonical_key(*((x_bits, o_bits) if turn else (o_bits, x_bits)))
+        waiting.setdefault(key, []).append((index, turn))
+    keys = sorted(waiting, key=lambda key: bin(key).count('1'), reverse=True)
+
+    if executor is not None:
+        solved = list(executor.map(solve_packed, keys))
+    elif workers == 1:
+        solved = [solve_packed(key) for key in keys]
+    else:
+        table = SharedTranspositionTable(memory)
+        try:
+            with make_pool(table, workers) as pool:
+                solved = list(pool.map(solve_packed, keys))
+        finally:
+            table.close()
+            table.unlink()
+
+    for key, value in zip(keys, solved):
+        for index, turn in waiting[key]:
+            values[index] = value if turn else -value
+    return values
+
+
+def _split_value(mine, theirs, split_ply, executor):
+    """
+    Finds the value of a game by handing out the games split_ply moves away to a pool,
+    and stops whatever it handed out that's still running once the value is known.
+    :param mine:        The bits of the marks of the player to move.
+    :param theirs:      The bits of the marks of the other player.
+    :param split_ply:   1 or 2, how many moves ahead to split the search.
+    :param executor:    The SolverPool to hand tasks to.
+    :return:            1 for a win, 0 for a tie, and -1 for a loss, for the player to move.
+    """
+    value, actions = tictactoesearch.forced_actions(mine, theirs)
+    if value is not None:
+        return value
+
+    # Each task is for some root action, and maybe a reply to it, and it's solved for whoever moves in its game.
+    # The value of a root action is for the player to move at the root, and only known once all its tasks are in,
+    # or once one of them shows the reply wins.
+    generation = executor.generation.value
+    tasks = {}
+    try:
+        action_values = {}
+        pending = {}
+        for cell in tictactoebitboard.cells(actions):
+            child_mine, child_theirs = theirs, mine | (1 << cell)
+            if split_ply == 1:
+                child = tictactoebitboard.pack((child_mine, child_theirs))
+                tasks[executor.submit(solve_packed, child, generation)] = (cell, None)
+                pending[cell] = 1
+                continue
+            reply_value, replies = tictactoesearch.forced_actions(child_mine, child_theirs)
+            if reply_value is not None:
+                action_values[cell] = -reply_value
+                continue
+            action_values[cell] = 1
+            pending[cell] = 0
+            for reply in tictactoebitboard.cells(replies):
+                grandchild = tictactoebitboard.pack((child_theirs, child_mine | (1 << reply)))
+                tasks[executor.submit(solve_packed, grandchild, generation)] = (cell, reply)
+                pending[cell] += 1
+
+        if any(value == 1 for cell, value in action_values.items() if cell not in pending):
+            return 1
+        for future in as_completed(tasks):
+            if future.cancelled():
+                continue
+            cell, reply = tasks[future]
+            if cell not in pending:
+                continue
+            if reply is None:
+                action_values[cell] = -future.result()
+            else:
+                # The root player gets the worst of the replies' values, each of which is for the root player too.
+                action_values[cell] = min(action_values[cell], future.result())
+            pending[cell] -= 1
+            if action_values[cell] == -1 and reply is not None:
+                # One refuting reply settles the action, so its other replies aren't needed.
+                _cancel({task: owner for task, owner in tasks.items() if owner[0] == cell})
+                del pending[cell]
+            elif not pending[cell]:
+                del pending[cell]
+            if action_values[cell] == 1 and cell not in pending:
+                return 1
+            if not pending:
+                break
+        return max(action_values.values())
+    finally:
+        # Once the value is known, nothing else handed out is needed, whether it has started or not.
+        _cancel(tasks)
+        executor.stop()
+
+
+def _cancel(tasks):
+    """
+    Cancels every task that hasn't started running yet.
+    :param tasks:   The futures to cancel.
+    """
+    for future in tasks:
+        future.cancel()
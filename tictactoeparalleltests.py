@@ -0,0 +1,93 @@
+"""
+A collection of unit-tests for tictactoeparallel.py.
+"""
+
+import multiprocessing
+import unittest
+# Use this to make the symmetric images of games.
+import tictactoebitboard
+# The functions we are testing are from this module.
+import tictactoeparallel
+# The search the parallel solves should agree with.
+import tictactoesearch
+import tictactoesymmetry
+from tictactoetable import SharedTranspositionTable
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+
+class TestParallelValue(unittest.TestCase):
+    """
+    A test case for the tictactoeparallel.parallel_value function.
+    """
+
+    def test_matches_alpha_beta_value(self):
+        """
+        Splitting the search at either ply should find the same values as searching in one process.
+        """
+        table = SharedTranspositionTable(1 << 20)
+        with tictactoeparallel.make_pool(table, 2) as executor:
+            for game in (data.BLANK_GAME_3D, data.OUTSIDE_CENTER, data.THREE_FILLED, data.X_WON_3D_XYZ):
+                wrapper = tictactoesearch.TicTacToeWrapper(game)
+                for turn in (True, False):
+                    for split_ply in (1, 2):
+                        self.assertEqual(tictactoeparallel.parallel_value(wrapper, turn, split_ply=split_ply,
+                                                                          executor=executor),
+                                         tictactoesearch.alpha_beta_value(wrapper, turn))
+        # The first game handed out is O to move after X takes the corner, and the workers' entry for it shows up here.
+        self.assertIsNotNone(table.probe(tictactoesymmetry.canonical_key(0, 1)[0]))
+        table.close()
+        table.unlink()
+
+    def test_own_pool(self):
+        """
+        Without an executor, a pool and a shared table should be made and cleaned up for the call,
+        with no worker left running once it returns, including after a win cuts the solve short.
+        """
+        for game, turn in ((data.OUTSIDE_CENTER, True), (data.THREE_FILLED, True), (data.THREE_FILLED, False)):
+            wrapper = tictactoesearch.TicTacToeWrapper(game)
+            self.assertEqual(tictactoeparallel.parallel_value(wrapper, turn, workers=2, memory=1 << 16),
+                             tictactoesearch.alpha_beta_value(wrapper, turn))
+            self.assertEqual(multiprocessing.active_children(), [])
+
+    def test_stop(self):
+        """
+        Tasks handed out before the pool is stopped should give up, and tasks handed out after should still run.
+        """
+        table = SharedTranspositionTable(1 << 16)
+        key = tictactoebitboard.pack((0, 1))
+        with tictactoeparallel.make_pool(table, 1) as pool:
+            generation = pool.generation.value
+            pool.stop()
+            self.assertIsNone(pool.submit(tictactoeparallel.solve_packed, key, generation).result())
+            self.assertEqual(pool.submit(tictactoeparallel.solve_packed, key, pool.generation.value).result(),
+                             tictactoesearch.negamax(0, 1, -1, 1))
+        table.close()
+        table.unlink()
+
+
+class TestSolveMany(unittest.TestCase):
+    """
+    A test case for the tictactoeparallel.solve_many function.
+    """
+
+    def test_matches_alpha_beta_value(self):
+        """
+        Every frame of the recorded games, with each frame's symmetric images and repeats mixed in,
+        should get the same value as solving it on its own, in the order it was given.
+        """
+        positions = []
+        for game in data.GAME_1 + data.GAME_2:
+            x_bits, o_bits = tictactoebitboard.from_array(game)
+            for symmetry in (0, 5, 47, 0):
+                image = tictactoebitboard.to_array((tictactoesymmetry.transform(x_bits, symmetry),
+                                                    tictactoesymmetry.transform(o_bits, symmetry)))
+                positions.append((tictactoesearch.TicTacToeWrapper(image), data.whose_turn(game)))
+        expected = [tictactoesearch.alpha_beta_value(wrapper, turn) for wrapper, turn in positions]
+        self.assertEqual(tictactoeparallel.solve_many(positions), expected)
+        self.assertEqual(tictactoeparallel.solve_many(positions[:16], workers=2, memory=1 << 16), expected[:16])
+        self.assertEqual(tictactoeparallel.solve_many([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
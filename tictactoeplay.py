@@ -2,10 +2,12 @@
 A module dedicated to playing tic tac toe with a human.
 """
 
+import sys
 from blessed import Terminal
 from numpy import ravel_multi_index
 import tictactoedata as data
 import tictactoe
+import tictactoebitboard
 
 VERTICAL_SLICES = """
       {}````{}````{}
@@ -57,9 +59,10 @@ def game_loop():
     current_game = data.BLANK_GAME_3D
     xs_turn = True  # True when it's X's turn, False otherwise.
     game_states = []  # A collection of game states to manipulate at the end.
+    empty_cells = tictactoebitboard.FULL  # A bitboard mask of the spots nobody has marked yet.
     with term.fullscreen(), term.cbreak():  # We capture the full screen and don't print out input.
         while not tictactoe.game_over_3d(current_game):  # We go until the game is over.
-            available_actions = tictactoe.available_spots(current_game)
+            available_actions = list(map(tictactoebitboard.cell_coordinate, tictactoebitboard.cells(empty_cells)))
             assert len(available_actions) > 0  # Otherwise, the game should be over ...
             potential_action_index = 0
             action = None
@@ -95,12 +98,18 @@ def game_loop():
             game_states.append(current_game)
             current_game = current_game.copy()
             current_game[0 if xs_turn else 1][action] = True
+            empty_cells &= ~(1 << tictactoebitboard.cell_index(action))
             xs_turn = not xs_turn
         game_states.append(current_game)  # We append the winning game state.
     return game_states
 
 
 if __name__ == '__main__':
+    # Pass --profile to see how long the win checks took over the game.
+    profile = '--profile' in sys.argv
+    if profile:
+        import tictactoeprofile
+        tictactoeprofile.enable()
     game_frames = game_loop()
     assert len(game_frames) > 0
     last_frame = game_frames[-1]
@@ -116,3 +125,6 @@ if __name__ == '__main__':
     print('The following game states were reached (flattened).')
     for game in game_frames:
         print(list(map(lambda boolean: int(boolean), game.flatten())))
+    if profile:
+        tictactoeprofile.disable()
+        print(tictactoeprofile.report())
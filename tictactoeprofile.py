@@ -0,0 +1,148 @@
+"""
+A module to count the calls to the hot functions of tic tac toe and time them, without attaching a profiler.
+
+Profiling is off unless enable is called, which swaps each function in PROFILED for a wrapper counting its calls
+and timing them, on the module or class that holds it. disable puts the original functions back, so there's nothing
+left to slow anything down when profiling is off. Callers have to look functions up through their modules,
+like tictactoe.has_won_3d, or through objects, like TABLE.probe, for the wrappers to see the calls,
+which every module here does.
+
+Each function's total time includes the profiled functions it calls, like negamax calling canonical_key and itself,
+and its own time leaves them out, so the own times add up to the time spent in profiled functions.
+A recursive function's total time is only taken from its outermost calls, so nested calls aren't counted twice.
+"""
+
+from collections import namedtuple
+# Use this to keep the names and docstrings of wrapped functions.
+import functools
+# Use this to time calls.
+import time
+import tictactoe
+import tictactoebitboard
+import tictactoesearch
+import tictactoesymmetry
+import tictactoetable
+
+# The functions to profile, by the module they're found in, with a dot for methods.
+# The win checks on arrays, finding actions, and making and scoring successors are what game_loop and min_max_value
+# spend their time in, and the win checks on bitboards, canonical keys, settling and searching games,
+# and the table are what alpha_beta_value and solve spend theirs in.
+PROFILED = (
+    (tictactoe, ('has_won_2d', 'has_won_3d', 'game_over_3d', 'available_spots')),
+    (tictactoesearch, ('play', 'utility', 'forced_actions', 'negamax')),
+    (tictactoebitboard, ('has_won', 'winning_cells')),
+    (tictactoesymmetry, ('canonical_key',)),
+    (tictactoetable, ('TranspositionTable.probe', 'TranspositionTable.store')),
+)
+
+# What's known about the calls to one function: how many, the seconds spent in them, and the seconds spent in them
+# outside of other profiled functions.
+ProfileEntry = namedtuple('ProfileEntry', ['calls', 'total', 'own'])
+
+# The original functions swapped out, keyed by the module or class and the name they were swapped out of.
+_ORIGINALS = {}
+
+# The calls, total seconds, and own seconds of every profiled function, and how many of its calls are running,
+# keyed by name.
+_COUNTERS = {}
+
+# The seconds spent in profiled functions called by each profiled call still running, innermost last.
+_CHILDREN = [0.0]
+
+
+def enable():
+    """
+    Starts profiling, wrapping every function in PROFILED. Enabling it again does nothing.
+    Running a module as a script makes a second copy of it named __main__, which isn't wrapped,
+    so a script has to call the functions of the module imported under its own name to profile them.
+    """
+    for module, names in PROFILED:
+        for name in names:
+            # A method is wrapped on its class, so every instance sees the wrapper.
+            *path, attribute = name.split('.')
+            holder = module
+            for part in path:
+                holder = getattr(holder, part)
+            if (holder, attribute) in _ORIGINALS:
+                continue
+            function = getattr(holder, attribute)
+            _ORIGINALS[(holder, attribute)] = function
+            setattr(holder, attribute, _wrap(name, function))
+
+
+def disable():
+    """
+    Stops profiling, putting back every function that was wrapped. The counts are kept until reset.
+    """
+    for (holder, name), function in _ORIGINALS.items():
+        setattr(holder, name, function)
+    _ORIGINALS.clear()
+
+
+def enabled():
+    """
+    Returns True if any functions are being profiled.
+    """
+    return bool(_ORIGINALS)
+
+
+def reset():
+    """
+    Zeroes the counts of every function.
+    """
+    # The wrappers hold on to their counters, so they're zeroed in place.
+    for counter in _COUNTERS.values():
+        counter[:3] = [0, 0.0, 0.0]
+
+
+def _wrap(name, function):
+    """
+    Makes a wrapper counting the calls to a function and timing them.
+    :param name:        The name to count the calls under.
+    :param function:    The function to wrap.
+    :return:            A function taking the same arguments and giving the same results.
+    """
+    counter = _COUNTERS.setdefault(name, [0, 0.0, 0.0, 0])
+    perf_counter = time.perf_counter
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        _CHILDREN.append(0.0)
+        counter[3] += 1
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            children = _CHILDREN.pop()
+            _CHILDREN[-1] += elapsed
+            counter[3] -= 1
+            counter[0] += 1
+            if not counter[3]:
+                counter[1] += elapsed
+            counter[2] += elapsed - children
+    return wrapper
+
+
+def results():
+    """
+    Returns the counts of every function called since the last reset.
+    :return:    A dictionary from function names to ProfileEntry tuples.
+    """
+    return {name: ProfileEntry(*counter[:3]) for name, counter in _COUNTERS.items() if counter[0]}
+
+
+def report():
+    """
+    Lays out the counts of every function called since the last reset as a table, the most own time first.
+    :return:    A string of the table.
+    """
+    entries = results()
+    total_own = sum(entry.own for entry in entries.values())
+    lines = ['{:<26} {:>10} {:>12} {:>12} {:>10} {:>7}'.format('function', 'calls', 'total (ms)', 'own (ms)',
+                                                               'own (us)', 'share')]
+    for name, entry in sorted(entries.items(), key=lambda item: item[1].own, reverse=True):
+        lines.append('{:<26} {:>10} {:>12.1f} {:>12.1f} {:>10.2f} {:>7.1%}'.format(
+            name, entry.calls, entry.total * 1e3, entry.own * 1e3, entry.own / entry.calls * 1e6,
+            entry.own / total_own if total_own else 0.0))
+    return '\n'.join(lines)
@@ -0,0 +1,100 @@
+"""
+A collection of unit-tests for tictactoeprofile.py.
+"""
+
+import unittest
+# The functions we are testing are from these modules.
+import tictactoeprofile
+import tictactoe
+import tictactoesearch
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+
+def profiled_functions():
+    """
+    Looks up every function in tictactoeprofile.PROFILED as it is right now.
+    :return:    A list of the functions, wrapped or not.
+    """
+    functions = []
+    for module, names in tictactoeprofile.PROFILED:
+        for name in names:
+            holder = module
+            for part in name.split('.'):
+                holder = getattr(holder, part)
+            functions.append(holder)
+    return functions
+
+
+class TestProfile(unittest.TestCase):
+    """
+    A test case for the tictactoeprofile functions.
+    """
+
+    def setUp(self):
+        tictactoeprofile.reset()
+
+    def tearDown(self):
+        tictactoeprofile.disable()
+
+    def test_restores(self):
+        """
+        Disabling should put back the very same functions, so nothing is left wrapped.
+        """
+        originals = profiled_functions()
+        tictactoeprofile.enable()
+        tictactoeprofile.enable()
+        self.assertTrue(tictactoeprofile.enabled())
+        for wrapped, original in zip(profiled_functions(), originals):
+            self.assertIsNot(wrapped, original)
+            self.assertIs(wrapped.__wrapped__, original)
+        tictactoeprofile.disable()
+        self.assertFalse(tictactoeprofile.enabled())
+        self.assertEqual(profiled_functions(), originals)
+
+    def test_counts(self):
+        """
+        Calls made through the modules should be counted, with the win checks on slices left out of own time.
+        """
+        tictactoeprofile.enable()
+        self.assertTrue(tictactoe.has_won_3d(data.X_WON_3D_XYZ[0]))
+        self.assertFalse(tictactoe.game_over_3d(data.BLANK_GAME_3D))
+        wrapper = tictactoesearch.TicTacToeWrapper(data.SEVEN_FILLED)
+        tictactoesearch.utility(tictactoesearch.play(wrapper, tictactoesearch.possible_actions(wrapper)[0], True))
+        tictactoeprofile.disable()
+        # Nothing is counted once profiling is off.
+        tictactoe.has_won_3d(data.BLANK_GAME_3D[0])
+
+        entries = tictactoeprofile.results()
+        self.assertEqual(entries['has_won_3d'].calls, 3)
+        self.assertEqual(entries['game_over_3d'].calls, 1)
+        self.assertEqual(entries['has_won_2d'].calls, 3 * 9)
+        self.assertEqual((entries['play'].calls, entries['utility'].calls), (1, 1))
+        self.assertLess(entries['has_won_3d'].own, entries['has_won_3d'].total)
+        for entry in entries.values():
+            self.assertLessEqual(entry.own, entry.total)
+        self.assertIn('has_won_2d', tictactoeprofile.report())
+
+        tictactoeprofile.reset()
+        self.assertEqual(tictactoeprofile.results(), {})
+
+    def test_solve(self):
+        """
+        A solve should be counted in the functions it spends its time in, with negamax's nested calls only adding to
+        its total time once.
+        """
+        tictactoesearch.TABLE.clear()
+        tictactoeprofile.enable()
+        tictactoesearch.solve(tictactoesearch.TicTacToeWrapper(data.THREE_FILLED), True)
+        tictactoeprofile.disable()
+
+        entries = tictactoeprofile.results()
+        for name in ('has_won', 'winning_cells', 'canonical_key', 'forced_actions', 'negamax',
+                     'TranspositionTable.probe', 'TranspositionTable.store'):
+            self.assertGreater(entries[name].calls, 0, name)
+        self.assertGreater(entries['negamax'].calls, 1)
+        self.assertLessEqual(entries['negamax'].total, sum(entry.own for entry in entries.values()) + 1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
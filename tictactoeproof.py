@@ -0,0 +1,146 @@
+"""
+A module to prove or disprove forced wins in tic tac toe by proof-number search.
+
+Rather than working out the value of every game like min_max_value, a proof-number search only asks
+whether one player, the attacker, can force a win.
+Every game in the tree keeps a proof number, the fewest games still to be shown won to prove it,
+and a disproof number, the fewest still to be shown not won to disprove it.
+Each step expands the most proving game, found by following the smallest proof numbers where the attacker moves
+and the smallest disproof numbers where the defender moves, so lopsided games are settled with few expansions.
+
+Games are settled without expanding them when tictactoesearch.forced_actions can, and only the forced blocks
+are expanded when the player to move has to block, so the rules are the same as min_max_value's.
+"""
+
+from collections import namedtuple
+import tictactoebitboard
+import tictactoesearch
+
+# The proof or disproof number of a game that can never be proven or disproven.
+INFINITY = float('inf')
+
+# The answer of a proof-number search.
+# proven is True if the attacker can force a win, False if it can't, and None if the search ran out of nodes.
+# proof and disproof are the root's numbers, nodes counts every game made, and expanded counts the games expanded.
+# tree is the proof or disproof as nested dictionaries from coordinate tuples to the tree below them,
+# with one move where the winning side moves and every move where the other side does, or None if nothing was shown.
+ProofResult = namedtuple('ProofResult', ['proven', 'proof', 'disproof', 'nodes', 'expanded', 'tree'])
+
+
+class _Node:
+    """
+    A game in a proof-number search tree.
+    """
+
+    __slots__ = ('mine', 'theirs', 'attacking', 'proof', 'disproof', 'actions', 'children', 'parent')
+
+    def __init__(self, mine, theirs, attacking, parent=None):
+        """
+        Makes a game, settling it right away if forced_actions can.
+        :param mine:        The bits of the marks of the player to move.
+        :param theirs:      The bits of the marks of the other player.
+        :param attacking:   True if the attacker is the player to move.
+        :param parent:      The _Node this game was played from, or None at the root.
+        """
+        self.mine = mine
+        self.theirs = theirs
+        self.attacking = attacking
+        self.parent = parent
+        self.children = None
+        value, self.actions = tictactoesearch.forced_actions(mine, theirs)
+        if value is None:
+            self.proof, self.disproof = 1, 1
+        elif (value == 1) == attacking:
+            self.proof, self.disproof = 0, INFINITY
+        else:
+            self.proof, self.disproof = INFINITY, 0
+
+    def expand(self):
+        """
+        Makes every successor of this game.
+        :return:    How many games were made.
+        """
+        self.children = [(cell, _Node(self.theirs, self.mine | (1 << cell), not self.attacking, self))
+                         for cell in tictactoebitboard.cells(self.actions)]
+        self.update()
+        return len(self.children)
+
+    def update(self):
+        """
+        Works this game's numbers out again from its successors'.
+        :return:    True if either number changed.
+        """
+        proofs = [child.proof for _, child in self.children]
+        disproofs = [child.disproof for _, child in self.children]
+        # The attacker only needs one successor proven, and the defender only needs one successor disproven.
+        if self.attacking:
+            numbers = min(proofs), sum(disproofs)
+        else:
+            numbers = sum(proofs), min(disproofs)
+        changed = numbers != (self.proof, self.disproof)
+        self.proof, self.disproof = numbers
+        return changed
+
+
+def proof_number_search(wrapper, turn, attacker=None, max_nodes=None):
+    """
+    Finds out whether a player can force a win.
+    :param wrapper:     The TicTacToeWrapper to search from.
+    :param turn:        A boolean indicating if it's x's turn (True) or not (False).
+    :param attacker:    True to ask about x's win, False to ask about o's, or None to ask about the player to move.
+    :param max_nodes:   How many games to make before giving up, or None to go until the answer is known.
+    :return:            A ProofResult.
+    """
+    attacker = turn if attacker is None else attacker
+    game_state_utility = tictactoesearch.utility(wrapper)
+    if game_state_utility is not None:
+        proven = game_state_utility == (1 if attacker else -1)
+        return ProofResult(proven, 0 if proven else INFINITY, INFINITY if proven else 0, 1, 0, {} if proven else None)
+
+    x_bits, o_bits = tictactoebitboard.unpack(wrapper.key)
+    mine, theirs = (x_bits, o_bits) if turn else (o_bits, x_bits)
+    root = _Node(mine, theirs, attacker == turn)
+    nodes, expanded = 1, 0
+    while root.proof and root.disproof and (max_nodes is None or nodes < max_nodes):
+        node = _most_proving(root)
+        nodes += node.expand()
+        expanded += 1
+        # The numbers only need updating up to the first game they don't change.
+        node = node.parent
+        while node is not None and node.update():
+            node = node.parent
+
+    proven = True if not root.proof else False if not root.disproof else None
+    tree = None if proven is None else _proof_tree(root, proven)
+    return ProofResult(proven, root.proof, root.disproof, nodes, expanded, tree)
+
+
+def _most_proving(node):
+    """
+    Walks down to the game whose expansion would help settle the search the most.
+    :param node:    The _Node to start from, which isn't settled.
+    :return:        An unexpanded _Node.
+    """
+    while node.children is not None:
+        if node.attacking:
+            node = min((child for _, child in node.children), key=lambda child: child.proof)
+        else:
+            node = min((child for _, child in node.children), key=lambda child: child.disproof)
+    return node
+
+
+def _proof_tree(node, proven):
+    """
+    Pulls the proof or disproof out of a settled search tree.
+    :param node:    A settled _Node.
+    :param proven:  True to pull out the proof, False to pull out the disproof.
+    :return:        Nested dictionaries from coordinate tuples to the tree below them.
+    """
+    if node.children is None:
+        return {}
+    # The side that won picks one settled successor, and the other side's every move has to be answered.
+    winning_side = node.attacking == proven
+    settled = [(cell, child) for cell, child in node.children if (child.proof if proven else child.disproof) == 0]
+    if winning_side:
+        settled = settled[:1]
+    return {tictactoebitboard.cell_coordinate(cell): _proof_tree(child, proven) for cell, child in settled}
@@ -0,0 +1,89 @@
+"""
+A collection of unit-tests for tictactoeproof.py.
+"""
+
+import unittest
+# The function we are testing is from this module.
+from tictactoeproof import proof_number_search
+# The searches the proofs should agree with.
+import tictactoebitboard
+import tictactoesearch
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+
+def check_tree(test, tree, mine, theirs, winning):
+    """
+    Checks that a proof tree really forces a win, replaying its moves on bitboards.
+    :param test:    The TestCase to make assertions with.
+    :param tree:    The nested dictionaries from the ProofResult.
+    :param mine:    The bits of the marks of the player to move.
+    :param theirs:  The bits of the marks of the other player.
+    :param winning: True if the player to move is the one forcing the win.
+    """
+    value, actions = tictactoesearch.forced_actions(mine, theirs)
+    if not tree:
+        test.assertEqual(value, 1 if winning else -1)
+        return
+    test.assertIsNone(value)
+    moves = {tictactoebitboard.cell_index(action) for action in tree}
+    if winning:
+        test.assertEqual(len(moves), 1)
+    else:
+        test.assertEqual(moves, set(tictactoebitboard.cells(actions)))
+    for action, subtree in tree.items():
+        check_tree(test, subtree, theirs, mine | (1 << tictactoebitboard.cell_index(action)), not winning)
+
+
+class TestProofNumberSearch(unittest.TestCase):
+    """
+    A test case for the tictactoeproof.proof_number_search function.
+    """
+
+    def test_matches_alpha_beta_value(self):
+        """
+        A win should be proven exactly when alpha-beta says the attacker wins, with a proof tree that holds up.
+        """
+        for game in (data.BLANK_GAME_3D, data.OUTSIDE_CENTER, data.THREE_FILLED, data.SEVEN_FILLED,
+                     data.FIVE_FROM_FILLED, data.RANDOM_INCOMPLETE):
+            wrapper = tictactoesearch.TicTacToeWrapper(game)
+            turn = bool(game[0].sum() == game[1].sum())
+            value = tictactoesearch.alpha_beta_value(wrapper, turn)
+            x_bits, o_bits = tictactoebitboard.unpack(wrapper.key)
+            mine, theirs = (x_bits, o_bits) if turn else (o_bits, x_bits)
+            for attacker in (True, False):
+                result = proof_number_search(wrapper, turn, attacker)
+                self.assertEqual(result.proven, value == (1 if attacker else -1))
+                self.assertEqual((result.proof, result.disproof) == (0, float('inf')), result.proven)
+                self.assertGreaterEqual(result.nodes, result.expanded)
+                # A disproof of one player's win is the other player's proof, since these games can't tie.
+                check_tree(self, result.tree, mine, theirs, result.proven == (attacker == turn))
+
+    def test_lopsided_games(self):
+        """
+        Games that are nearly over should be settled with barely any expansions.
+        """
+        for game in (data.FIVE_FROM_FILLED, data.RANDOM_INCOMPLETE, data.SIX_FILLED):
+            result = proof_number_search(tictactoesearch.TicTacToeWrapper(game), bool(game[0].sum() == game[1].sum()))
+            self.assertLessEqual(result.expanded, 1)
+
+    def test_out_of_nodes(self):
+        """
+        A search that runs out of nodes shouldn't claim an answer.
+        """
+        result = proof_number_search(tictactoesearch.TicTacToeWrapper(data.BLANK_GAME_3D), True, max_nodes=10)
+        self.assertIsNone(result.proven)
+        self.assertIsNone(result.tree)
+        self.assertGreater(result.proof, 0)
+
+    def test_finished_game(self):
+        """
+        A game that's over is proven or disproven without a search.
+        """
+        wrapper = tictactoesearch.TicTacToeWrapper(data.X_WON_3D_XYZ)
+        self.assertTrue(proof_number_search(wrapper, False, True).proven)
+        self.assertFalse(proof_number_search(wrapper, False).proven)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+A module to number tic tac toe games with consecutive integers, so data about games can go in flat arrays.
+
+Games are numbered in blocks, one block for each number of x's and o's a real game can have,
+from the blank board up to the full board.
+Inside a block, a game's number is the rank of the cells x took among all the cells,
+times the number of ways o could take its cells, plus the rank of the cells o took among the cells x left.
+Sets of cells are ranked in colexicographic order: {c1 < c2 < ... < ck} is numbered C(c1, 1) + C(c2, 2) + ...
+
+Only the counts of marks are checked, so a game where both players have three in a row still gets a number.
+"""
+
+import numpy as np
+
+# BINOMIAL[n, k] is n choose k, for every n and k a 2d or 3d game needs.
+BINOMIAL = np.zeros((28, 28), dtype=np.int64)
+for _n in range(28):
+    BINOMIAL[_n, 0] = 1
+    for _k in range(1, _n + 1):
+        BINOMIAL[_n, _k] = BINOMIAL[_n - 1, _k - 1] + BINOMIAL[_n - 1, _k]
+
+
+def _blocks(ndim):
+    """
+    Lists the counts of marks a game can have, with the number of the first game of each.
+    :param ndim:    The number of dimensions of the game (2 or 3).
+    :return:        A list of (x's, o's) pairs, in order,
+                    and an int64 array of the number of the first game with each, plus the number of games at the end.
+    """
+    cells = 3 ** ndim
+    counts = [(marks - marks // 2, marks // 2) for marks in range(cells + 1)]
+    sizes = [BINOMIAL[cells, x_count] * BINOMIAL[cells - x_count, o_count] for x_count, o_count in counts]
+    return counts, np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+
+
+# The counts of marks and first numbers of each block, for 2d and 3d games.
+BLOCKS = {2: _blocks(2), 3: _blocks(3)}
+
+
+def count(ndim):
+    """
+    Returns how many games there are to number.
+    :param ndim:    The number of dimensions of the game (2 or 3).
+    :return:        One more than the largest number rank gives.
+    """
+    return int(BLOCKS[ndim][1][-1])
+
+
+def rank(game):
+    """
+    Numbers a game.
+    :param game:    The 2d or 3d tic-tac-toe structure. X must have as many marks as o, or one more.
+    :return:        An int between 0 and count(ndim) - 1.
+    """
+    game = np.asarray(game, dtype=bool)
+    x_count, o_count = int(game[0].sum()), int(game[1].sum())
+    if x_count - o_count not in (0, 1):
+        raise ValueError('x must have as many marks as o, or one more')
+    return int(rank_batch(game[np.newaxis])[0])
+
+
+def unrank(index, ndim):
+    """
+    Finds the game with a number.
+    :param index:   An int between 0 and count(ndim) - 1.
+    :param ndim:    The number of dimensions of the game (2 or 3).
+    :return:        The 2d or 3d tic-tac-toe structure numbered index.
+    """
+    if not 0 <= index < count(ndim):
+        raise ValueError('there is no game numbered {}'.format(index))
+    return unrank_batch(np.array([index], dtype=np.int64), ndim)[0]
+
+
+def rank_batch(games):
+    """
+    Numbers every game in a stack. Unlike rank, the counts of marks aren't checked.
+    :param games:   A (N, 2, 3, 3) or (N, 2, 3, 3, 3) stack of games.
+    :return:        An int64 array of length N.
+    """
+    games = np.asarray(games, dtype=bool)
+    ndim = games.ndim - 2
+    cells = 3 ** ndim
+    offsets = BLOCKS[ndim][1]
+    x_marks = games[:, 0].reshape(len(games), cells)
+    o_marks = games[:, 1].reshape(len(games), cells)
+    x_count = x_marks.sum(axis=1)
+    o_count = o_marks.sum(axis=1)
+    # o's cells are renumbered among the cells x left, so each one moves down by the number of x's before it.
+    x_before = np.cumsum(x_marks, axis=1) - x_marks
+    o_cells = np.arange(cells) - x_before
+    x_rank = rank_subsets(x_marks, np.broadcast_to(np.arange(cells), x_marks.shape))
+    o_rank = rank_subsets(o_marks, o_cells)
+    block = x_count + o_count
+    return offsets[block] + x_rank * BINOMIAL[cells - x_count, o_count] + o_rank
+
+
+def rank_subsets(marks, positions):
+    """
+    Ranks sets of cells in colexicographic order.
+    :param marks:       A (N, cells) boolean array of which cells are in each set.
+    :param positions:   A (N, cells) array of the number each cell has among the cells it's picked from.
+    :return:            An int64 array of the rank of each set.
+    """
+    # The i-th smallest cell of a set, counting from 1, adds positions choose i.
+    order = np.cumsum(marks, axis=1)
+    return np.where(marks, BINOMIAL[positions, order], 0).sum(axis=1)
+
+
+def unrank_batch(indices, ndim):
+    """
+    Finds the games with every number in an array.
+    :param indices: An int64 array of numbers between 0 and count(ndim) - 1.
+    :param ndim:    The number of dimensions of the game (2 or 3).
+    :return:        A (N, 2, 3, 3) or (N, 2, 3, 3, 3) stack of games.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    cells = 3 ** ndim
+    counts, offsets = BLOCKS[ndim]
+    block = np.searchsorted(offsets, indices, side='right') - 1
+    x_count = np.array([x_count for x_count, _ in counts])[block]
+    o_count = np.array([o_count for _, o_count in counts])[block]
+    within = indices - offsets[block]
+    o_ways = BINOMIAL[cells - x_count, o_count]
+    x_marks = _unrank_subsets(within // o_ways, x_count, cells)
+    o_among_free = _unrank_subsets(within % o_ways, o_count, cells)
+
+    # The o cells were numbered among the cells x left, so they're put back in those cells, in order.
+    free = ~x_marks
+    free_order = np.cumsum(free, axis=1) - 1
+    rows, free_cells = np.nonzero(free)
+    o_marks = np.zeros_like(x_marks)
+    o_marks[rows, free_cells] = o_among_free[rows, free_order[rows, free_cells]]
+    return np.stack((x_marks, o_marks), axis=1).reshape((len(indices), 2) + (3,) * ndim)
+
+
+def _unrank_subsets(ranks, sizes, cells):
+    """
+    Finds the sets of cells with some colexicographic ranks.
+    :param ranks:   An int64 array of ranks.
+    :param sizes:   An int array of how many cells are in each set.
+    :param cells:   How many cells the sets are picked from.
+    :return:        A (N, cells) boolean array of which cells are in each set.
+    """
+    ranks = ranks.copy()
+    marks = np.zeros((len(ranks), cells), dtype=bool)
+    # The largest cell is the last one whose binomial still fits in the rank, then the rest come from what's left.
+    for size in range(int(sizes.max(initial=0)), 0, -1):
+        rows = np.nonzero(sizes >= size)[0]
+        largest = np.searchsorted(BINOMIAL[:cells, size], ranks[rows], side='right') - 1
+        marks[rows, largest] = True
+        ranks[rows] -= BINOMIAL[largest, size]
+    return marks
@@ -0,0 +1,62 @@
+"""
+A collection of unit-tests for tictactoerank.py.
+"""
+
+import unittest
+# Use this to build arrays of numbers and games.
+import numpy as np
+# The functions we are testing are from this module.
+import tictactoerank
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+
+class TestRank(unittest.TestCase):
+    """
+    A test case for the tictactoerank rank and unrank functions.
+    """
+
+    def test_every_2d_game(self):
+        """
+        Every 2d number should unrank to a different game that ranks back to the same number.
+        """
+        indices = np.arange(tictactoerank.count(2))
+        games = tictactoerank.unrank_batch(indices, 2)
+        self.assertTrue((tictactoerank.rank_batch(games) == indices).all())
+        self.assertEqual(len({game.tobytes() for game in games}), len(indices))
+        self.assertFalse((games[:, 0] & games[:, 1]).any())
+
+    def test_3d_round_trip(self):
+        """
+        Random 3d numbers should round trip, along with the smallest and largest.
+        """
+        indices = np.random.default_rng(4100).integers(0, tictactoerank.count(3), 10000)
+        indices = np.concatenate((indices, [0, tictactoerank.count(3) - 1]))
+        games = tictactoerank.unrank_batch(indices, 3)
+        self.assertTrue((tictactoerank.rank_batch(games) == indices).all())
+
+    def test_examples(self):
+        """
+        The examples with legal counts of marks should round trip, and the others should be refused.
+        """
+        self.assertEqual(tictactoerank.rank(data.BLANK_GAME_3D), 0)
+        for game in (data.BLANK_GAME_2D, data.MIDGAME_2D, data.SEVEN_FILLED,
+                     data.ELEVEN_FROM_FILLED) + tuple(data.GAME_1):
+            self.assertTrue((tictactoerank.unrank(tictactoerank.rank(game), game.ndim - 1) == game).all())
+        with self.assertRaises(ValueError):
+            tictactoerank.rank(data.TIED_2D)
+        with self.assertRaises(ValueError):
+            tictactoerank.unrank(tictactoerank.count(2), 2)
+
+    def test_empty(self):
+        """
+        An empty stack of games should number to an empty array, and back.
+        """
+        for ndim in (2, 3):
+            games = tictactoerank.unrank_batch(np.zeros(0, dtype=np.int64), ndim)
+            self.assertEqual(games.shape, (0, 2) + (3,) * ndim)
+            self.assertEqual(len(tictactoerank.rank_batch(games)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
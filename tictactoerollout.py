@@ -0,0 +1,92 @@
+"""
+A module to play many random games of tic tac toe at once, advancing them all a move at a time as numpy arrays.
+
+Every game in a batch moves on each step: each player to move picks an empty cell at random,
+its counts of marks on every line go up by the row of the line incidence matrix for that cell,
+and any game where the mover now has three on a line, or where the board has filled up, drops out of the batch.
+The rules are the same as min_max_value's: the center of a 3d game is never played, and a player with no actions loses.
+rollout_batch can be given other cells to play instead, like every cell for a game where the center is allowed.
+"""
+
+from collections import namedtuple
+import numpy as np
+# Use this for the line incidence matrices and to classify the games a batch starts from.
+import tictactoebatch
+
+# The outcomes of a batch of random games.
+# x_wins, o_wins, and ties count the games, and mean_length is the average number of moves played in them.
+RolloutStats = namedtuple('RolloutStats', ['x_wins', 'o_wins', 'ties', 'games', 'mean_length'])
+
+# The line incidence matrices as small ints, with a row for each cell saying which lines it's on.
+_CELL_LINES = {ndim: incidence.T.astype(np.int8) for ndim, incidence in tictactoebatch.LINE_INCIDENCE.items()}
+
+# Which cells can be played, leaving out the center of a 3d game.
+_PLAYABLE = {2: np.ones(9, dtype=bool), 3: np.arange(27) != 13}
+
+
+def rollout_batch(games, turns, rng=None, playable=None):
+    """
+    Plays out every game in a stack at random.
+    :param games:       A (N, 2, 3, 3) or (N, 2, 3, 3, 3) stack of games to play out.
+    :param turns:       A boolean array of length N, True where it's x's turn.
+    :param rng:         A numpy Generator to pick moves with, or None for a fresh one.
+    :param playable:    A boolean array of which flattened cells can be played,
+                        or None for every cell but the center of a 3d game.
+    :return:            An int8 array of the outcome of each game for x, 1 for a win, 0 for a tie, and -1 for a loss,
+                        and an int array of how many moves were played in each game.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    games = np.asarray(games, dtype=bool)
+    count = len(games)
+    ndim = games.ndim - 2
+    cell_lines = _CELL_LINES[ndim]
+    flat = games.reshape(count, 2, 3 ** ndim)
+    line_counts = flat.astype(np.int8) @ cell_lines
+    empty = ~(flat[:, 0] | flat[:, 1])
+    free = empty & (_PLAYABLE[ndim] if playable is None else np.asarray(playable, dtype=bool))
+    mover = np.where(np.asarray(turns, dtype=bool), 0, 1)
+
+    # Games that are over already keep the outcome they start with.
+    status = tictactoebatch.status_batch(games)
+    outcomes = np.zeros(count, dtype=np.int8)
+    outcomes[status.o_won] = -1
+    outcomes[status.x_won] = 1
+    lengths = np.zeros(count, dtype=np.int64)
+    going = np.nonzero(status.ongoing)[0]
+
+    while len(going):
+        # A player with no actions loses.
+        stuck = ~free[going].any(axis=1)
+        outcomes[going[stuck]] = np.where(mover[going[stuck]] == 0, -1, 1)
+        going = going[~stuck]
+
+        # The free cell with the biggest random number is a uniformly random free cell.
+        choice = np.where(free[going], rng.random((len(going), free.shape[1])), -1.0).argmax(axis=1)
+        free[going, choice] = False
+        empty[going, choice] = False
+        players = mover[going]
+        line_counts[going, players] += cell_lines[choice]
+        lengths[going] += 1
+
+        won = (line_counts[going, players] == 3).any(axis=1)
+        outcomes[going[won]] = np.where(players[won] == 0, 1, -1)
+        tied = ~won & ~empty[going].any(axis=1)
+        mover[going] ^= 1
+        going = going[~won & ~tied]
+    return outcomes, lengths
+
+
+def rollouts(game, turn, count, seed=None):
+    """
+    Plays a game out at random many times, and sums up how the games ended.
+    :param game:    The 2d or 3d tic-tac-toe structure to play out.
+    :param turn:    A boolean indicating if it's x's turn (True) or not (False).
+    :param count:   How many games to play.
+    :param seed:    A seed for the random moves, or None for different games each time.
+    :return:        A RolloutStats.
+    """
+    game = np.asarray(game, dtype=bool)
+    games = np.broadcast_to(game, (count,) + game.shape)
+    outcomes, lengths = rollout_batch(games, np.full(count, turn), np.random.default_rng(seed))
+    return RolloutStats(int((outcomes == 1).sum()), int((outcomes == -1).sum()), int((outcomes == 0).sum()), count,
+                        float(lengths.mean()) if count else 0.0)
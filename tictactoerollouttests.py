@@ -0,0 +1,71 @@
+"""
+A collection of unit-tests for tictactoerollout.py.
+"""
+
+import unittest
+# Use this to build stacks of games.
+import numpy as np
+# The functions we are testing are from this module.
+import tictactoerollout
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+
+class TestRollouts(unittest.TestCase):
+    """
+    A test case for the tictactoerollout.rollout_batch and tictactoerollout.rollouts functions.
+    """
+
+    def test_2d_odds(self):
+        """
+        Random 2d games from a blank board are won by x about 58.5% of the time, o 28.8%, and tied 12.7%.
+        """
+        stats = tictactoerollout.rollouts(data.BLANK_GAME_2D, True, 20000, seed=4100)
+        self.assertEqual(stats.x_wins + stats.o_wins + stats.ties, stats.games)
+        self.assertAlmostEqual(stats.x_wins / stats.games, 0.585, delta=0.02)
+        self.assertAlmostEqual(stats.o_wins / stats.games, 0.288, delta=0.02)
+        self.assertAlmostEqual(stats.ties / stats.games, 0.127, delta=0.02)
+
+    def test_finished_games(self):
+        """
+        Games that are over already should keep their outcome without any moves.
+        """
+        games = np.stack([data.X_WON_3D_XYZ, data.X_WON_3D_X, data.BLANK_GAME_3D])
+        outcomes, lengths = tictactoerollout.rollout_batch(games, [False, False, True], np.random.default_rng(1))
+        self.assertEqual(outcomes[:2].tolist(), [1, 1])
+        self.assertEqual(lengths[:2].tolist(), [0, 0])
+        self.assertGreaterEqual(lengths[2], 5)
+
+    def test_3d_never_ties(self):
+        """
+        3d games can't tie when the center is never played, since a player with no actions loses.
+        """
+        stats = tictactoerollout.rollouts(data.BLANK_GAME_3D, True, 2000, seed=1)
+        self.assertEqual(stats.ties, 0)
+        self.assertGreaterEqual(stats.mean_length, 5)
+        self.assertLessEqual(stats.mean_length, 26)
+
+    def test_center_allowed(self):
+        """
+        Given every cell to play, some games should be won by taking the center, which the default rules never play.
+        """
+        # X has two opposite corners, so only the center between them wins in one move.
+        game = np.zeros((2, 27), dtype=bool)
+        game[0, [0, 26]] = True
+        game[1, [1, 5]] = True
+        games = np.broadcast_to(game.reshape(2, 3, 3, 3), (500, 2, 3, 3, 3))
+        for playable, center_wins in ((None, False), (np.ones(27, dtype=bool), True)):
+            outcomes, lengths = tictactoerollout.rollout_batch(games, np.ones(500, dtype=bool),
+                                                               np.random.default_rng(1), playable)
+            self.assertEqual(((outcomes == 1) & (lengths == 1)).any(), center_wins)
+
+    def test_no_games(self):
+        """
+        Playing no games should count nothing, rather than fail on an empty stack.
+        """
+        for game in (data.BLANK_GAME_2D, data.BLANK_GAME_3D):
+            self.assertEqual(tictactoerollout.rollouts(game, True, 0), (0, 0, 0, 0, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,11 +2,19 @@
 A module to run search algorithms on a game of tic tac toe.
 """
 
-from functools import lru_cache
-import tictactoe
+from collections import namedtuple
+from contextlib import contextmanager
+import sys
+import tictactoebitboard
+from tictactoedatabase import SolvedDatabase
+import tictactoelines
+from tictactoeordering import MoveOrdering
+import tictactoesymmetry
+from tictactoethreats import threat_sequence
+from tictactoetable import TranspositionTable, EXACT, LOWER, UPPER
+import tictactoezobrist
 from tictactoedata import X_TAKEN_CENTER_CENTER_3D, OUTSIDE_CENTER, OUTSIDE_CENTER2
 import numpy as np
-from hashlib import sha1
 
 
 class TicTacToeWrapper:
@@ -14,16 +22,42 @@ class TicTacToeWrapper:
     A lite wrapper class to define hashable behavior for caching.
     """
 
-    def __init__(self, data):
+    def __init__(self, data, parent=None, cell=None, player=None):
+        """
+        Wraps a game, either working everything out from its data or updating it from the game it was played from.
+        :param data:    The 3d-tic-tac-toe structure to wrap.
+        :param parent:  The TicTacToeWrapper the game was played from, or None to start from the data.
+        :param cell:    The cell number of the mark placed on the parent.
+        :param player:  0 if the mark placed on the parent was an x, 1 if it was an o.
+        """
         self.data = data
-        # This method copied from https://stackoverflow.com/a/5173201
-        self.hash = int(sha1(data.view(np.bool)).hexdigest(), 16)
+        if parent is None:
+            board = tictactoebitboard.from_array(data)
+            # The marks on every line, so play only has to check the lines through its move.
+            self.counts = tictactoelines.line_counts(data)
+            # The index of the first player along the data's first axis with three in a row, or None.
+            self.winner = next((player for player in range(len(data)) if tictactoelines.has_won(self.counts, player)),
+                               None)
+            # A bitboard mask of the empty cells, so finding actions doesn't scan the cube.
+            self.empty = tictactoebitboard.FULL & ~(board[0] | board[1])
+            # Both players' marks packed into one int, which is all equality has to compare.
+            self.key = tictactoebitboard.pack(board)
+            # A Zobrist hash of the marks, which play updates with a single XOR.
+            self.hash = tictactoezobrist.zobrist_hash(board)
+        else:
+            self.counts, completed = tictactoelines.place(parent.counts, cell, player)
+            self.winner = parent.winner
+            if completed and (self.winner is None or player < self.winner):
+                self.winner = player
+            self.empty = parent.empty & ~(1 << cell)
+            self.key = parent.key | (1 << (cell + player * tictactoebitboard.CELLS))
+            self.hash = tictactoezobrist.toggle(parent.hash, cell, player)
 
     def __hash__(self):
         return self.hash
 
     def __eq__(self, other):
-        return np.all(self.data == other.data)
+        return self.key == other.key
 
 
 def utility(wrapper):
@@ -32,11 +66,11 @@ def utility(wrapper):
     :param wrapper: The TicTacToeWrapper to evaluate for utility.
     :return:        The utility of tic tac toe if terminal, else None.
     """
-    if tictactoe.has_won_3d(wrapper.data[0]):
+    if wrapper.winner == 0:
         return 1
-    elif tictactoe.has_won_3d(wrapper.data[1]):
+    elif wrapper.winner == 1:
         return -1
-    elif tictactoe.game_over_3d(wrapper.data):
+    elif not wrapper.empty:
         return 0
     else:
         return None
@@ -50,9 +84,10 @@ def play(wrapper, action, turn):
     :param turn:    A boolean indicating if it's x's turn (True) or not (False).
     :return:        A new wrapped TicTacToeWrapper.
     """
+    player = 0 if turn else 1
     new_copy = np.copy(wrapper.data)
-    new_copy[0 if turn else 1][action] = True
-    return TicTacToeWrapper(new_copy)
+    new_copy[player][action] = True
+    return TicTacToeWrapper(new_copy, wrapper, tictactoebitboard.cell_index(action), player)
 
 
 def min_max_value(wrapper, turn):
@@ -74,17 +109,44 @@ def possible_actions(wrapper):
     Returns all the possible actions.
     :param wrapper: The TicTacToeWrapper to evaluate possible actions for.
     """
-    return list(filter(lambda x: x != (1, 1, 1), tictactoe.available_spots(wrapper.data)))
+    # The center is never playable, so it's masked out along with the taken cells.
+    return [tictactoebitboard.COORDINATES[cell]
+            for cell in tictactoebitboard.cells(wrapper.empty & tictactoebitboard.PLAYABLE)]
+
+
+# Values found by min_max_value_helper, keyed by the canonical key of x's and o's marks with the turn in the lowest bit.
+# X's value doesn't change under the cube's symmetries, so symmetric games share one entry.
+MIN_MAX_TABLE = TranspositionTable()
 
 
-@lru_cache(maxsize=None)
 def min_max_value_helper(wrapper, turn):
     """
-    Recursively finds the min, max, value of a certain wrapped game, exits early on utility.
+    Recursively finds the min, max, value of a certain wrapped game, remembering values in MIN_MAX_TABLE.
+    :param wrapper: The TicTacToeWrapper to evaluate with a value.
+    :param turn:    A boolean indicating if it's x's turn (True) or not (False).
+    :return:        The end result utility of this wrapped game of tic tac toe after applying min max.
+    """
+    key = tictactoesymmetry.canonical_key(*tictactoebitboard.unpack(wrapper.key))[0] << 1 | turn
+    entry = MIN_MAX_TABLE.probe(key)
+    if entry is not None:
+        return entry[0]
+    value = min_max_search(wrapper, turn)
+    MIN_MAX_TABLE.store(key, value, EXACT, bin(wrapper.empty).count('1'))
+    return value
+
+
+def min_max_search(wrapper, turn):
+    """
+    Finds the min, max, value of a certain wrapped game from its successors, exits early on utility.
     :param wrapper: The TicTacToeWrapper to evaluate with a value.
     :param turn:    A boolean indicating if it's x's turn (True) or not (False).
     :return:        The end result utility of this wrapped game of tic tac toe after applying min max.
     """
+    # A win made of threats settles the game before any successor is made.
+    x_bits, o_bits = tictactoebitboard.unpack(wrapper.key)
+    if threat_sequence(*((x_bits, o_bits) if turn else (o_bits, x_bits))) is not None:
+        return 1 if turn else -1
+
     successors = list(map(lambda action: play(wrapper, action, turn),
                           possible_actions(wrapper)))
     successor_utilities = map(lambda successor: utility(successor), successors)
@@ -114,5 +176,270 @@ def min_max_value_helper(wrapper, turn):
         return 1
 
 
+# Values found by negamax, keyed by the canonical key of the marks of the player to move and the other player.
+# Call TABLE.clear() or TABLE.resize(memory) between solves to free it up or change its budget.
+TABLE = TranspositionTable()
+
+# The killer and history tables negamax learns as it goes, to try the actions most likely to cut off first.
+# What it learns from one game can slow down the search of an unrelated one, so clear it with TABLE between those.
+ORDERING = MoveOrdering()
+
+# The answer of solve: the value for x, the best move as a coordinate tuple,
+# and the principal variation, the moves of both players in turn under best play, starting with the best move.
+SolveResult = namedtuple('SolveResult', ['value', 'move', 'pv'])
+
+# A function negamax calls at every node, which raises SearchStopped to give up on the search, or None.
+# The parallel solver's workers set it, so a task can be given up on once its answer isn't needed.
+STOP = None
+
+
+class SearchStopped(Exception):
+    """
+    Raised inside negamax by STOP to give up on a search. Nothing is stored for the games left unfinished.
+    """
+
+
+# The SolvedDatabase negamax looks games up in once they miss TABLE, and adds every game it proves the value of to,
+# or None to keep nothing between runs. It's only set for the length of a call given a database.
+DATABASE = None
+
+# The tictactoestats.SearchStats negamax counts its work in, or None to count nothing.
+# It's only set for the length of a call given a SearchStats, so by default counting costs one check per node.
+STATS = None
+
+
+@contextmanager
+def _recording(stats):
+    """
+    Has negamax count its work in a SearchStats for the length of a with block.
+    :param stats:   The tictactoestats.SearchStats to count in, or None to count nothing.
+    """
+    global STATS
+    if stats is None:
+        yield
+        return
+    previous = STATS
+    STATS = stats
+    stats.start(TABLE)
+    try:
+        yield
+    finally:
+        stats.stop()
+        STATS = previous
+
+
+@contextmanager
+def _consulting(database):
+    """
+    Has negamax look games up in and add games to a SolvedDatabase for the length of a with block.
+    :param database:    The SolvedDatabase to use, or None to use none.
+    """
+    global DATABASE
+    if database is None:
+        yield
+        return
+    previous = DATABASE
+    DATABASE = database
+    try:
+        yield
+    finally:
+        DATABASE = previous
+
+
+def alpha_beta_value(wrapper, turn, database=None, stats=None):
+    """
+    Finds the same value as min_max_value, with an alpha-beta negamax search.
+    :param wrapper:     The TicTacToeWrapper to evaluate with a value.
+    :param turn:        A boolean indicating if it's x's turn (True) or not (False).
+    :param database:    A SolvedDatabase to look games up in as the search reaches them,
+                        and to add the games it proves to, or None.
+    :param stats:       A tictactoestats.SearchStats to count the search's work in, or None.
+    :return:            The end result utility of this wrapped game of tic tac toe after applying min max.
+    """
+    game_state_utility = utility(wrapper)
+    if game_state_utility is not None:
+        return game_state_utility
+    x_bits, o_bits = tictactoebitboard.unpack(wrapper.key)
+    mine, theirs = (x_bits, o_bits) if turn else (o_bits, x_bits)
+    with _recording(stats), _consulting(database):
+        value = negamax(mine, theirs, -1, 1)
+    return value if turn else -value
+
+
+def forced_actions(mine, theirs):
+    """
+    Settles a game without searching if it can, and otherwise narrows down the actions worth searching.
+    The game is assumed not to be over, and like min_max_value_helper, a player with no actions loses.
+    :param mine:    The bits of the marks of the player to move.
+    :param theirs:  The bits of the marks of the other player.
+    :return:        A tuple of the value for the player to move and 0 if the game is settled,
+                    or else a tuple of None and a mask of the actions to search.
+    """
+    actions = ~(mine | theirs) & tictactoebitboard.PLAYABLE
+    # We exit early if we can win right away, or lose if there's nowhere to go.
+    if tictactoebitboard.winning_cells(mine, actions):
+        return 1, 0
+    if not actions:
+        return -1, 0
+    # If the other player could win right away, every action but blocking them loses, and two threats can't be blocked.
+    threats = tictactoebitboard.winning_cells(theirs, actions)
+    if threats & (threats - 1):
+        return -1, 0
+    return None, threats or actions
+
+
+def negamax(mine, theirs, alpha, beta):
+    """
+    Recursively finds the value of a game for the player to move, cutting off once the window is decided.
+    The game is assumed not to be over, and like min_max_value_helper, a player with no actions loses.
+    The best move is stored in TABLE along with the value, for solve to read back.
+    With a DATABASE, games missing from TABLE are looked up in it, and games whose value is proven are added to it.
+    :param mine:    The bits of the marks of the player to move.
+    :param theirs:  The bits of the marks of the other player.
+    :param alpha:   A value the player to move is already guaranteed elsewhere.
+    :param beta:    A value the other player is already guaranteed elsewhere.
+    :return:        1 for a win, 0 for a tie, and -1 for a loss, for the player to move.
+                    Values at or below alpha are upper bounds, and values at or above beta are lower bounds.
+    """
+    if STOP is not None:
+        STOP()
+    if STATS is not None:
+        STATS.node(bin(mine | theirs).count('1'))
+    # Symmetric games have the same value, so they share one entry keyed on their canonical game.
+    key, symmetry = tictactoesymmetry.canonical_key(mine, theirs)
+    entry = TABLE.probe(key)
+    if entry is not None:
+        value, bound, _ = entry
+        if bound == EXACT or (bound == LOWER and value >= beta) or (bound == UPPER and value <= alpha):
+            return value
+        if bound == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+
+    # The number of empty cells stands in for how much work went into an entry, so the table keeps big subtrees.
+    depth = tictactoebitboard.CELLS - bin(mine | theirs).count('1')
+    if DATABASE is not None:
+        value = DATABASE.get(key)
+        if value is not None:
+            TABLE.store(key, value, EXACT, depth)
+            return value
+    value, actions = forced_actions(mine, theirs)
+    if value is not None:
+        if STATS is not None:
+            STATS.terminal()
+        TABLE.store(key, value, EXACT, depth)
+        return value
+
+    # Wins and blocks were dealt with by forced_actions, so only the learned tables and line degrees matter here,
+    # apart from the best move from an earlier search, which goes first.
+    ordered = ORDERING.order(mine, theirs, actions, tactical=False)
+    if entry is not None:
+        stored_move = TABLE.best_move(key)
+        if stored_move is not None:
+            hash_move = int(tictactoesymmetry.INVERSES[symmetry][stored_move])
+            if hash_move in ordered:
+                ordered.remove(hash_move)
+                ordered.insert(0, hash_move)
+
+    window_alpha = alpha
+    best = -1
+    best_cell = ordered[0]
+    for cell in ordered:
+        value = -negamax(theirs, mine | (1 << cell), -beta, -alpha)
+        if value > best:
+            best = value
+            best_cell = cell
+            alpha = max(alpha, best)
+            # Once the other player has a better choice elsewhere, nothing we find here matters.
+            if alpha >= beta:
+                ORDERING.cutoff(mine, theirs, cell, depth)
+                if STATS is not None:
+                    STATS.cutoff()
+                break
+
+    # The move is stored as it would be played in the canonical game, since that's the game the key stands for.
+    move = int(tictactoesymmetry.SYMMETRIES[symmetry][best_cell])
+    if best <= window_alpha:
+        TABLE.store(key, best, UPPER, depth, move)
+    elif best >= beta:
+        TABLE.store(key, best, LOWER, depth, move)
+    else:
+        TABLE.store(key, best, EXACT, depth, move)
+    # Values are between -1 and 1, so a win or a loss is exact whatever the window, and only a tie can be a bound.
+    if DATABASE is not None and (best or window_alpha < 0 < beta):
+        DATABASE.add(mine, theirs, best)
+    return best
+
+
+def solve(wrapper, turn, stats=None, database=None):
+    """
+    Finds the value of a game, the best move, and the line of best play after it, from one search.
+    Each game along the line is looked up in TABLE, so solving the game after the next move costs almost nothing.
+    :param wrapper:     The TicTacToeWrapper to solve.
+    :param turn:        A boolean indicating if it's x's turn (True) or not (False).
+    :param stats:       A tictactoestats.SearchStats to count the work of the search and of following the line in,
+                        or None.
+    :param database:    A SolvedDatabase to look games up in as the search reaches them,
+                        and to add the games it proves to, or None.
+    :return:            A SolveResult. The value is for x, like min_max_value, and the move is None if the game is over.
+    """
+    game_state_utility = utility(wrapper)
+    if game_state_utility is not None:
+        return SolveResult(game_state_utility, None, [])
+    x_bits, o_bits = tictactoebitboard.unpack(wrapper.key)
+    mine, theirs = (x_bits, o_bits) if turn else (o_bits, x_bits)
+    line = []
+    with _recording(stats), _consulting(database):
+        value = negamax(mine, theirs, -1, 1)
+        while True:
+            cell = _best_cell(mine, theirs)
+            if cell is None:
+                break
+            line.append(tictactoebitboard.cell_coordinate(cell))
+            mine, theirs = theirs, mine | (1 << cell)
+            if tictactoebitboard.has_won(theirs):
+                break
+    return SolveResult(value if turn else -value, line[0] if line else None, line)
+
+
+def _best_cell(mine, theirs):
+    """
+    Finds the best move in a game that isn't over, searching with the full window so the stored move is exact.
+    :param mine:    The bits of the marks of the player to move.
+    :param theirs:  The bits of the marks of the other player.
+    :return:        A cell number, or None if the player to move has no actions.
+    """
+    value, actions = forced_actions(mine, theirs)
+    if value == 1:
+        wins = tictactoebitboard.winning_cells(mine, ~(mine | theirs) & tictactoebitboard.PLAYABLE)
+        return (wins & -wins).bit_length() - 1
+    if value == -1:
+        # Every action loses, so any of them will do.
+        actions = ~(mine | theirs) & tictactoebitboard.PLAYABLE
+        return (actions & -actions).bit_length() - 1 if actions else None
+    value = negamax(mine, theirs, -1, 1)
+    key, symmetry = tictactoesymmetry.canonical_key(mine, theirs)
+    move = TABLE.best_move(key)
+    if move is None:
+        # The value came from the database, which keeps no moves, so the move is the first one keeping the value.
+        return next(cell for cell in tictactoebitboard.cells(actions)
+                    if -negamax(theirs, mine | (1 << cell), -1, 1) == value)
+    return int(tictactoesymmetry.INVERSES[symmetry][move])
+
+
 if __name__ == '__main__':
-    print(min_max_value(TicTacToeWrapper(OUTSIDE_CENTER), False))
+    if '--profile' in sys.argv:
+        # This script is a copy of tictactoesearch named __main__, so the solves go through the module imported under
+        # its own name, whose functions are the ones wrapped. The database is left out so the solves actually run.
+        import tictactoeprofile
+        import tictactoesearch
+        tictactoeprofile.enable()
+        print(tictactoesearch.solve(tictactoesearch.TicTacToeWrapper(OUTSIDE_CENTER), False))
+        print(tictactoesearch.min_max_value(tictactoesearch.TicTacToeWrapper(OUTSIDE_CENTER), False))
+        tictactoeprofile.disable()
+        print(tictactoeprofile.report())
+    else:
+        # Games solved on earlier runs are kept on disk, so running this again is instant.
+        with SolvedDatabase() as solved:
+            print(alpha_beta_value(TicTacToeWrapper(OUTSIDE_CENTER), False, solved))
@@ -0,0 +1,167 @@
+"""
+A collection of unit-tests for tictactoesearch.py, and the searches built alongside it.
+"""
+
+import unittest
+# Use this to find the moves made in recorded games.
+import numpy as np
+# The functions we are testing are from these modules.
+import tictactoebitboard
+import tictactoesearch
+import tictactoesymmetry
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+# Every 3d example, including every frame of the recorded games.
+EXAMPLES_3D = [value for value in vars(data).values()
+               if hasattr(value, 'shape') and value.shape == (2, 3, 3, 3)] + data.GAME_1 + data.GAME_2
+
+
+class TestTicTacToeWrapper(unittest.TestCase):
+    """
+    A test case for the hashing and equality of tictactoesearch.TicTacToeWrapper.
+    """
+
+    def test_played_matches_wrapped(self):
+        """
+        A game reached by play should hash and compare the same as the same game wrapped from scratch.
+        """
+        for game in (data.GAME_1, data.GAME_2):
+            played = tictactoesearch.TicTacToeWrapper(game[0])
+            for frame in game[1:]:
+                # The move is the one mark in the frame that wasn't there before.
+                # The recorded games don't always alternate, so the player is read off the mark too.
+                player, *action = np.argwhere(frame & ~played.data)[0].tolist()
+                action = tuple(action)
+                played = tictactoesearch.play(played, action, player == 0)
+                wrapped = tictactoesearch.TicTacToeWrapper(frame)
+                self.assertEqual(played, wrapped)
+                self.assertEqual(hash(played), hash(wrapped))
+                self.assertEqual(played.winner, wrapped.winner)
+                self.assertEqual(played.empty, wrapped.empty)
+
+    def test_different_games(self):
+        """
+        Different games should not compare equal, even with the same marks for different players.
+        """
+        x_center = tictactoesearch.TicTacToeWrapper(data.X_TAKEN_CENTER_CENTER_3D)
+        o_center = tictactoesearch.TicTacToeWrapper(data.X_TAKEN_CENTER_CENTER_3D[::-1].copy())
+        self.assertNotEqual(x_center, o_center)
+        self.assertNotEqual(hash(x_center), hash(o_center))
+
+
+class TestMinMaxValue(unittest.TestCase):
+    """
+    A test case for the table behind tictactoesearch.min_max_value.
+    """
+
+    def test_symmetric_games_share_entries(self):
+        """
+        Once a game is solved, every game symmetric to it should be answered from the table without storing anything.
+        """
+        tictactoesearch.MIN_MAX_TABLE.clear()
+        expected = tictactoesearch.min_max_value(tictactoesearch.TicTacToeWrapper(data.SEVEN_FILLED), True)
+        stores = tictactoesearch.MIN_MAX_TABLE.stores
+        x_bits, o_bits = tictactoebitboard.from_array(data.SEVEN_FILLED)
+        for symmetry in (5, 17, 47):
+            image = tictactoebitboard.to_array((tictactoesymmetry.transform(x_bits, symmetry),
+                                                tictactoesymmetry.transform(o_bits, symmetry)))
+            self.assertEqual(tictactoesearch.min_max_value(tictactoesearch.TicTacToeWrapper(image), True), expected)
+        self.assertEqual(tictactoesearch.MIN_MAX_TABLE.stores, stores)
+
+
+class TestAlphaBetaValue(unittest.TestCase):
+    """
+    A test case for the tictactoesearch.alpha_beta_value function.
+    """
+
+    def test_matches_min_max_value(self):
+        """
+        Alpha-beta should find the same values as plain min max on every example.
+        """
+        for game in EXAMPLES_3D:
+            wrapper = tictactoesearch.TicTacToeWrapper(game)
+            self.assertEqual(tictactoesearch.alpha_beta_value(wrapper, data.whose_turn(game)),
+                             tictactoesearch.min_max_value(wrapper, data.whose_turn(game)))
+
+    def test_either_turn(self):
+        """
+        The value should follow the turn we ask about, not the number of marks.
+        """
+        for game in (data.OUTSIDE_CENTER, data.SEVEN_FILLED, data.RANDOM_INCOMPLETE_LESSERV2):
+            wrapper = tictactoesearch.TicTacToeWrapper(game)
+            for turn in (True, False):
+                self.assertEqual(tictactoesearch.alpha_beta_value(wrapper, turn),
+                                 tictactoesearch.min_max_value(wrapper, turn))
+
+    def test_finished_games(self):
+        """
+        Finished games should just be worth their utility.
+        """
+        wrapper = tictactoesearch.TicTacToeWrapper(data.X_WON_3D_XYZ)
+        self.assertEqual(tictactoesearch.alpha_beta_value(wrapper, False), 1)
+
+    def test_stop(self):
+        """
+        A search told to stop part way through should give up, and then search as usual once STOP is unset.
+        """
+        nodes = []
+
+        def stop():
+            nodes.append(None)
+            if len(nodes) > 10:
+                raise tictactoesearch.SearchStopped()
+
+        wrapper = tictactoesearch.TicTacToeWrapper(data.BLANK_GAME_3D)
+        tictactoesearch.TABLE.clear()
+        tictactoesearch.STOP = stop
+        try:
+            with self.assertRaises(tictactoesearch.SearchStopped):
+                tictactoesearch.alpha_beta_value(wrapper, True)
+        finally:
+            tictactoesearch.STOP = None
+        self.assertEqual(tictactoesearch.alpha_beta_value(wrapper, True), tictactoesearch.min_max_value(wrapper, True))
+
+
+class TestSolve(unittest.TestCase):
+    """
+    A test case for the tictactoesearch.solve function.
+    """
+
+    def test_principal_variation(self):
+        """
+        The value should match alpha-beta, and every move along the line should keep it, ending the game.
+        """
+        for game in (data.BLANK_GAME_3D, data.OUTSIDE_CENTER, data.THREE_FILLED, data.SEVEN_FILLED):
+            wrapper = tictactoesearch.TicTacToeWrapper(game)
+            for turn in (True, False):
+                result = tictactoesearch.solve(wrapper, turn)
+                self.assertEqual(result.value, tictactoesearch.alpha_beta_value(wrapper, turn))
+                self.assertEqual(result.move, result.pv[0])
+                played, mover = wrapper, turn
+                for action in result.pv:
+                    self.assertIn(action, tictactoesearch.possible_actions(played))
+                    self.assertEqual(tictactoesearch.alpha_beta_value(played, mover), result.value)
+                    played = tictactoesearch.play(played, action, mover)
+                    mover = not mover
+                self.assertEqual(tictactoesearch.utility(played), result.value)
+
+    def test_reuses_search(self):
+        """
+        Solving the game after the first two moves of a line should give the rest of the same line.
+        """
+        wrapper = tictactoesearch.TicTacToeWrapper(data.OUTSIDE_CENTER)
+        result = tictactoesearch.solve(wrapper, False)
+        wrapper = tictactoesearch.play(tictactoesearch.play(wrapper, result.pv[0], False), result.pv[1], True)
+        self.assertEqual(tictactoesearch.solve(wrapper, False).pv, result.pv[2:])
+
+    def test_finished_game(self):
+        """
+        A game that's over has no move to make.
+        """
+        result = tictactoesearch.solve(tictactoesearch.TicTacToeWrapper(data.X_WON_3D_XYZ), False)
+        self.assertEqual(result, (1, None, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+A module to count what the searches of tic tac toe do, for finding out where their time goes.
+
+A SearchStats is handed to a search, which calls node, terminal, and cutoff on it as it goes.
+Transposition table hits, misses, and collisions are read off the table's own counters at the start and the end,
+so probing costs nothing extra. Searches only make these calls when they're given a SearchStats,
+so leaving it out, which is the default, costs one check against None per node.
+
+Long solves can also log their progress every so often through the logging module, at the INFO level.
+"""
+
+# Use this to log progress during long searches.
+import logging
+# Use this to time searches.
+import time
+import tictactoebitboard
+
+# The logger progress goes to unless told otherwise.
+LOGGER = logging.getLogger(__name__)
+
+# How many nodes to count between looks at the clock, when logging progress.
+_CLOCK_INTERVAL = 4096
+
+
+class SearchStats:
+    """
+    Counts of the work done by a search, from the nodes at each ply to the time it took.
+    Plies are counted by the marks on the board, so a search from a blank cube starts at ply 0.
+    """
+
+    def __init__(self, progress=None, logger=LOGGER):
+        """
+        Starts with every count at zero.
+        :param progress:    How many seconds to wait between progress logs, or None to never log progress.
+        :param logger:      The logging.Logger to log progress to.
+        """
+        self.progress = progress
+        self.logger = logger
+        self.nodes = 0
+        self.nodes_per_ply = [0] * (tictactoebitboard.CELLS + 1)
+        self.terminals = 0
+        self.cutoffs = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.peak_table_size = 0
+        self.elapsed = 0.0
+        self._table = None
+        self._table_start = (0, 0, 0)
+        self._started = None
+        self._next_log = None
+
+    def start(self, table=None):
+        """
+        Starts timing, and counting the table's hits, misses, and collisions from here.
+        A search can be started and stopped more than once, and the counts add up.
+        :param table:   The TranspositionTable the search uses, or None if it doesn't use one.
+        """
+        self._table = table
+        self._table_start = self._table_counts()
+        self._started = time.perf_counter()
+        if self.progress is not None:
+            self._next_log = self._started + self.progress
+
+    def stop(self):
+        """
+        Stops timing, and takes in the table's counts since start.
+        """
+        if self._started is None:
+            return
+        self._catch_up()
+        self._started = None
+        self._table = None
+
+    def node(self, ply):
+        """
+        Counts a game the search visited.
+        :param ply: How many marks are on the board.
+        """
+        self.nodes += 1
+        self.nodes_per_ply[ply] += 1
+        if self._next_log is not None and not self.nodes % _CLOCK_INTERVAL:
+            now = time.perf_counter()
+            if now >= self._next_log:
+                self._next_log = now + self.progress
+                self._catch_up()
+                self.logger.info('%s', self)
+
+    def terminal(self):
+        """
+        Counts a game settled without searching any further, by a win, a loss, or having nowhere to go.
+        """
+        self.terminals += 1
+
+    def cutoff(self):
+        """
+        Counts a search cut off because the window was decided.
+        """
+        self.cutoffs += 1
+
+    def effective_branching_factor(self):
+        """
+        Works out how many actions a uniform tree would have to branch into at each ply to visit as many nodes.
+        :return:    The nodes to the power of one over the plies searched, or 0.0 if nothing was searched.
+        """
+        plies = [ply for ply, nodes in enumerate(self.nodes_per_ply) if nodes]
+        if not plies:
+            return 0.0
+        depth = plies[-1] - plies[0]
+        return float(self.nodes) ** (1 / depth) if depth else 1.0
+
+    def nodes_per_second(self):
+        """
+        Returns how many nodes were visited for every second of searching, or 0.0 if no time was taken.
+        """
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    def _table_counts(self):
+        """
+        Reads the table's running counts.
+        :return:    A tuple of the hits, misses, and collisions, all 0 without a table.
+        """
+        table = self._table
+        return (0, 0, 0) if table is None else (table.hits, table.misses, table.collisions)
+
+    def _catch_up(self):
+        """
+        Adds the time and the table's counts since the last catch up, so the counts are right in the middle of a search.
+        """
+        now = time.perf_counter()
+        self.elapsed += now - self._started
+        self._started = now
+        counts = self._table_counts()
+        self.hits += counts[0] - self._table_start[0]
+        self.misses += counts[1] - self._table_start[1]
+        self.collisions += counts[2] - self._table_start[2]
+        self._table_start = counts
+        if self._table is not None:
+            self.peak_table_size = max(self.peak_table_size, self._table.size)
+
+    def __str__(self):
+        probes = self.hits + self.misses
+        return ('{} nodes ({} terminal, {} cutoffs) in {:.3f}s, {:.0f} nodes/s, branching {:.2f}, '
+                'table {:.1%} hits of {} probes, {} collisions, {} entries at peak').format(
+                    self.nodes, self.terminals, self.cutoffs, self.elapsed, self.nodes_per_second(),
+                    self.effective_branching_factor(), self.hits / probes if probes else 0.0, probes,
+                    self.collisions, self.peak_table_size)
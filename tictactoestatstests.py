@@ -0,0 +1,83 @@
+"""
+A collection of unit-tests for tictactoestats.py, and the searches that count their work in it.
+"""
+
+import unittest
+# Use this to catch progress logs.
+import logging
+# The functions we are testing are from these modules.
+import tictactoestats
+import tictactoesearch
+import tictactoedeepening
+from tictactoetable import TranspositionTable
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+
+class TestSearchStats(unittest.TestCase):
+    """
+    A test case for the tictactoestats.SearchStats class, as filled in by tictactoesearch.solve.
+    """
+
+    def setUp(self):
+        tictactoesearch.TABLE.clear()
+
+    def test_counts(self):
+        """
+        A cold solve should visit nodes from its own ply onwards, and count its table probes, terminals, and cutoffs.
+        """
+        stats = tictactoestats.SearchStats()
+        wrapper = tictactoesearch.TicTacToeWrapper(data.OUTSIDE_CENTER)
+        result = tictactoesearch.solve(wrapper, False, stats)
+        self.assertEqual(result.value, tictactoesearch.alpha_beta_value(wrapper, False))
+
+        self.assertEqual(sum(stats.nodes_per_ply), stats.nodes)
+        first = next(ply for ply, nodes in enumerate(stats.nodes_per_ply) if nodes)
+        self.assertEqual(first, int(data.OUTSIDE_CENTER.sum()))
+        self.assertGreater(stats.terminals, 0)
+        self.assertGreater(stats.cutoffs, 0)
+        self.assertEqual(stats.hits + stats.misses, stats.nodes)
+        self.assertEqual(stats.peak_table_size, len(tictactoesearch.TABLE))
+        self.assertGreater(stats.elapsed, 0)
+        self.assertGreater(stats.effective_branching_factor(), 1)
+        self.assertIsNone(tictactoesearch.STATS)
+
+    def test_disabled(self):
+        """
+        Without a SearchStats nothing is counted, and solving again with one starts from a warm table.
+        """
+        wrapper = tictactoesearch.TicTacToeWrapper(data.THREE_FILLED)
+        tictactoesearch.solve(wrapper, True)
+        stats = tictactoestats.SearchStats()
+        tictactoesearch.alpha_beta_value(wrapper, True, stats=stats)
+        self.assertEqual(stats.nodes, 1)
+        self.assertEqual(stats.hits, 1)
+        self.assertEqual(stats.effective_branching_factor(), 1.0)
+
+    def test_progress(self):
+        """
+        Asking for progress every 0 seconds should log it as often as the clock is looked at.
+        """
+        stats = tictactoestats.SearchStats(progress=0)
+        stats.start()
+        with self.assertLogs(tictactoestats.LOGGER, logging.INFO) as logs:
+            for _ in range(3 * tictactoestats._CLOCK_INTERVAL):
+                stats.node(0)
+        stats.stop()
+        self.assertEqual(len(logs.records), 3)
+        self.assertIn('{} nodes'.format(tictactoestats._CLOCK_INTERVAL), logs.output[0])
+
+    def test_deepening(self):
+        """
+        Iterative deepening should count the nodes it reports, and read the hits and misses off its own table.
+        """
+        stats = tictactoestats.SearchStats()
+        table = TranspositionTable(1 << 16)
+        result = tictactoedeepening.iterative_deepening(tictactoesearch.TicTacToeWrapper(data.OUTSIDE_CENTER), False,
+                                                        1, table, stats=stats)
+        self.assertEqual(stats.nodes, result.nodes)
+        self.assertEqual((stats.hits, stats.misses), (table.hits, table.misses))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+A module to map 3d tic-tac-toe games onto a canonical game out of everything they're symmetric to.
+
+The cube has 48 symmetries, the 6 ways to order its axes times the 8 ways to flip them.
+None of them change whether a game is won, and all of them keep the center where it is,
+so every game symmetric to another has the same value.
+"""
+
+# Use this to list every ordering and flipping of the axes.
+from itertools import permutations, product
+# Use this to look every symmetry up at once.
+import numpy as np
+# Use this for the cell numbering.
+import tictactoebitboard
+
+
+def _symmetries():
+    """
+    Lists where every symmetry of the cube sends every cell.
+    :return:    A (48, 27) array, holding the cell each cell is sent to by each symmetry.
+    """
+    symmetries = []
+    for axes in permutations(range(3)):
+        for flips in product((False, True), repeat=3):
+            symmetries.append([tictactoebitboard.cell_index(tuple(2 - coordinate[axis] if flip else coordinate[axis]
+                                                                  for axis, flip in zip(axes, flips)))
+                               for coordinate in tictactoebitboard.COORDINATES])
+    return np.array(symmetries)
+
+
+# SYMMETRIES[s][cell] is the cell that cell is sent to by symmetry s, and INVERSES[s] undoes it.
+# The first symmetry is the identity.
+SYMMETRIES = _symmetries()
+INVERSES = np.argsort(SYMMETRIES, axis=1)
+
+
+def _chunk_tables():
+    """
+    Tabulates every symmetry of every pattern of marks in each third of the cube.
+    :return:    A (3, 512, 48) array, where [chunk, pattern, s] is where symmetry s sends
+                the marks of pattern in cells 9 * chunk to 9 * chunk + 8.
+    """
+    tables = np.zeros((3, 512, len(SYMMETRIES)), dtype=np.uint64)
+    for chunk in range(3):
+        for cell_offset in range(9):
+            has_cell = (np.arange(512) >> cell_offset) & 1 == 1
+            images = np.left_shift(np.uint64(1), SYMMETRIES[:, chunk * 9 + cell_offset].astype(np.uint64))
+            tables[chunk, has_cell] |= images
+    return tables
+
+
+# Permuting a bitboard takes three lookups per symmetry instead of 27 bit moves.
+_CHUNK_TABLES = _chunk_tables()
+
+
+def images(bits):
+    """
+    Applies every symmetry to one player's marks.
+    :param bits:    The bits of one player's marks.
+    :return:        An array of the 48 bitboards those marks are sent to.
+    """
+    return _CHUNK_TABLES[0, bits & 511] | _CHUNK_TABLES[1, (bits >> 9) & 511] | _CHUNK_TABLES[2, bits >> 18]
+
+
+def canonical_key(first, second):
+    """
+    Finds the smallest packed key of any game symmetric to a game.
+    :param first:   The bits of the marks of one player, like the player to move.
+    :param second:  The bits of the marks of the other player.
+    :return:        A tuple of the canonical key, first's image in the low 27 bits and second's above,
+                    and the number of the symmetry that sends the game to it.
+    """
+    keys = images(first) | (images(second) << np.uint64(tictactoebitboard.CELLS))
+    symmetry = int(keys.argmin())
+    return int(keys[symmetry]), symmetry
+
+
+def transform(bits, symmetry):
+    """
+    Applies one symmetry to one player's marks.
+    :param bits:        The bits of one player's marks.
+    :param symmetry:    The number of the symmetry to apply.
+    :return:            The bitboard the marks are sent to.
+    """
+    return int(images(bits)[symmetry])
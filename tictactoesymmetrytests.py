@@ -0,0 +1,63 @@
+"""
+A collection of unit-tests for tictactoesymmetry.py.
+"""
+
+import unittest
+# The functions we are checking symmetric games against.
+import tictactoebitboard as bitboard
+import tictactoesearch
+# The functions we are testing are from this module.
+import tictactoesymmetry
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+
+class TestSymmetries(unittest.TestCase):
+    """
+    A test case for the tables of symmetries in tictactoesymmetry.
+    """
+
+    def test_symmetries_are_distinct(self):
+        """
+        There should be 48 different symmetries, starting with the identity, all keeping the center in place.
+        """
+        self.assertEqual(len(set(map(tuple, tictactoesymmetry.SYMMETRIES.tolist()))), 48)
+        self.assertEqual(tictactoesymmetry.SYMMETRIES[0].tolist(), list(range(27)))
+        self.assertTrue((tictactoesymmetry.SYMMETRIES[:, bitboard.CENTER] == bitboard.CENTER).all())
+
+    def test_lines_are_kept(self):
+        """
+        Every symmetry should send winning lines to winning lines, and undo with its inverse.
+        """
+        for line in bitboard.LINES:
+            self.assertTrue(set(map(int, tictactoesymmetry.images(line))) <= set(bitboard.LINES))
+            for symmetry in range(48):
+                image = tictactoesymmetry.transform(line, symmetry)
+                self.assertEqual(sum(1 << int(tictactoesymmetry.INVERSES[symmetry][cell])
+                                     for cell in bitboard.cells(image)), line)
+
+
+class TestCanonicalKey(unittest.TestCase):
+    """
+    A test case for the tictactoesymmetry.canonical_key function.
+    """
+
+    def test_symmetric_games_share_a_key(self):
+        """
+        Every symmetric copy of an example should have the example's canonical key and value.
+        """
+        for game in (data.SEVEN_FILLED, data.RANDOM_INCOMPLETE_LESSERV2, data.OUTSIDE_CENTER):
+            x_bits, o_bits = bitboard.from_array(game)
+            key, symmetry = tictactoesymmetry.canonical_key(x_bits, o_bits)
+            self.assertEqual(key, bitboard.pack((tictactoesymmetry.transform(x_bits, symmetry),
+                                                 tictactoesymmetry.transform(o_bits, symmetry))))
+            value = tictactoesearch.alpha_beta_value(tictactoesearch.TicTacToeWrapper(game), False)
+            for copy in (game.transpose(0, 3, 2, 1), game[:, ::-1], game[:, :, ::-1].transpose(0, 2, 1, 3)):
+                copy_bits = bitboard.from_array(copy)
+                self.assertEqual(tictactoesymmetry.canonical_key(*copy_bits)[0], key)
+                self.assertEqual(tictactoesearch.alpha_beta_value(tictactoesearch.TicTacToeWrapper(copy), False),
+                                 value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,266 @@
+"""
+A module of a fixed size transposition table, to remember values found by the searches in tictactoesearch.
+
+The table is a flat array of 64 bit words, so its memory use is set when it's made and never grows.
+Slots are paired into buckets: the first slot of a bucket keeps the deepest entry stored there,
+and the second slot takes whatever else comes along, so deep results survive while recent ones are still kept.
+An entry pushed out of the first slot by a deeper one moves to the second, and a key is only ever in one slot.
+
+A SharedTranspositionTable keeps the same words in shared memory, so every process of a parallel solve can use it.
+It takes no locks: each slot keeps its key XOR its data, so a slot half written by another process fails its check
+and reads as a miss, rather than giving back one entry's key with another entry's data.
+"""
+
+# Use this for compact arrays of 64 bit words.
+from array import array
+from collections import namedtuple
+
+# The kinds of values stored, exact values or bounds for values found outside a search window.
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# The memory a table uses unless told otherwise, in bytes.
+DEFAULT_MEMORY = 16 * 1024 * 1024
+
+# Each slot is a key word followed by a data word, and each bucket is a depth-preferred slot and an always-replace slot.
+_SLOT_WORDS = 2
+_BUCKET_WORDS = 2 * _SLOT_WORDS
+_WORD_BYTES = 8
+
+# The key word holds the key XOR the data word, so a torn slot doesn't match its key.
+# The data word holds the value offset to be unsigned in the low 16 bits, then the bound, then the depth,
+# then the best move plus one so 0 can mean no move,
+# and a flag in the top bit so a slot holding key 0 can be told apart from an empty slot.
+_VALUE_OFFSET = 1 << 15
+_BOUND_SHIFT = 16
+_DEPTH_SHIFT = 18
+_MOVE_SHIFT = 24
+_USED = 1 << 63
+
+# Keys are spread over the buckets by Fibonacci hashing, keeping the top bits of the key times this odd constant.
+_MULTIPLIER = 0x9E3779B97F4A7C15
+_WORD_MASK = (1 << 64) - 1
+
+# Some statistics about a table, in the spirit of lru_cache's cache_info.
+# Collisions are stores that pushed out an entry for a different key.
+TableInfo = namedtuple('TableInfo', ['hits', 'misses', 'stores', 'size', 'capacity', 'collisions'])
+
+
+class TranspositionTable:
+    """
+    A fixed size hash table from keys of up to 63 bits to a value, a bound, and a depth.
+    """
+
+    def __init__(self, memory=DEFAULT_MEMORY):
+        """
+        Makes an empty table.
+        :param memory:  The most bytes the table may use. It's rounded down to a power of two buckets.
+        """
+        self.resize(memory)
+
+    def resize(self, memory):
+        """
+        Makes the table use a new amount of memory, emptying it.
+        :param memory:  The most bytes the table may use. It's rounded down to a power of two buckets.
+        """
+        self._set_size(memory)
+        self.clear()
+
+    def _set_size(self, memory):
+        """
+        Works out how many buckets fit in an amount of memory, without making any room for them.
+        :param memory:  The most bytes the table may use. It's rounded down to a power of two buckets.
+        """
+        bucket_bits = max(0, (memory // (_BUCKET_WORDS * _WORD_BYTES)).bit_length() - 1)
+        self._shift = 64 - bucket_bits
+        self._memory = (_BUCKET_WORDS * _WORD_BYTES) << bucket_bits
+
+    def clear(self):
+        """
+        Empties the table, keeping its size.
+        """
+        self._words = array('Q', bytes(self._memory))
+        self._reset_statistics()
+
+    def _reset_statistics(self):
+        """
+        Zeroes the counts reported by info.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.size = 0
+        self.collisions = 0
+
+    def _bucket(self, key):
+        """
+        Finds the first word of the bucket a key belongs in.
+        :param key: The key to look for.
+        :return:    An index into the table's words.
+        """
+        return (((key * _MULTIPLIER) & _WORD_MASK) >> self._shift) * _BUCKET_WORDS
+
+    def probe(self, key):
+        """
+        Looks up an entry.
+        :param key: The key the entry was stored under.
+        :return:    A tuple of the value, the bound, and the depth, or None if the key isn't in the table.
+        """
+        words = self._words
+        index = self._bucket(key)
+        for slot in (index, index + _SLOT_WORDS):
+            data = words[slot + 1]
+            if data and words[slot] ^ data == key:
+                self.hits += 1
+                return (data & 0xFFFF) - _VALUE_OFFSET, (data >> _BOUND_SHIFT) & 3, (data >> _DEPTH_SHIFT) & 63
+        self.misses += 1
+        return None
+
+    def best_move(self, key):
+        """
+        Looks up the best move stored with an entry.
+        :param key: The key the entry was stored under.
+        :return:    The move, or None if the key isn't in the table or was stored without a move.
+        """
+        words = self._words
+        index = self._bucket(key)
+        for slot in (index, index + _SLOT_WORDS):
+            data = words[slot + 1]
+            if data and words[slot] ^ data == key:
+                move = (data >> _MOVE_SHIFT) & 63
+                return move - 1 if move else None
+        return None
+
+    def store(self, key, value, bound, depth, move=None):
+        """
+        Stores an entry, replacing whatever the replacement policy picks.
+        :param key:     The key to store the entry under.
+        :param value:   A value between -32768 and 32767.
+        :param bound:   EXACT, LOWER, or UPPER.
+        :param depth:   Between 0 and 63, how much searching the value took. Deeper entries are kept longer.
+        :param move:    The best move found, between 0 and 62, like a cell number, or None.
+        """
+        words = self._words
+        index = self._bucket(key)
+        data = _USED | (depth << _DEPTH_SHIFT) | (bound << _BOUND_SHIFT) | (value + _VALUE_OFFSET)
+        if move is not None:
+            data |= (move + 1) << _MOVE_SHIFT
+        recent = index + _SLOT_WORDS
+        kept = words[index + 1]
+        kept_key = words[index] ^ kept
+        replaced = words[recent + 1]
+        replaced_key = words[recent] ^ replaced
+        self.stores += 1
+        if kept and kept_key == key:
+            # A newer entry for the key in the depth-preferred slot overwrites it there.
+            slot = index
+        elif kept and depth < (kept >> _DEPTH_SHIFT) & 63:
+            # The depth-preferred slot is only given up to an entry at least as deep,
+            # so this goes in the always-replace slot, overwriting any older entry for the key there.
+            slot = recent
+            if not replaced:
+                self.size += 1
+            elif replaced_key != key:
+                self.collisions += 1
+        else:
+            # The entry pushed out of the depth-preferred slot moves down, pushing out the always-replace slot's entry,
+            # which can't be lost if it was an older entry for the same key.
+            slot = index
+            if not kept or not replaced:
+                self.size += 1
+            elif replaced_key != key:
+                self.collisions += 1
+            if kept:
+                words[recent] = words[index]
+                words[recent + 1] = kept
+        words[slot] = key ^ data
+        words[slot + 1] = data
+
+    def capacity(self):
+        """
+        Returns how many entries the table can hold.
+        """
+        return len(self._words) // _SLOT_WORDS
+
+    def info(self):
+        """
+        Returns statistics about the table.
+        :return:    A TableInfo.
+        """
+        return TableInfo(self.hits, self.misses, self.stores, self.size, self.capacity(), self.collisions)
+
+    def __len__(self):
+        return self.size
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    A TranspositionTable in shared memory, which any number of processes can probe and store into at once.
+    Statistics are only for the calls made by each process on its own copy of the table.
+    """
+
+    def __init__(self, memory=DEFAULT_MEMORY, name=None):
+        """
+        Makes an empty table in a new block of shared memory, or attaches to the table of another process.
+        :param memory:  The most bytes the table may use. It's rounded down to a power of two buckets.
+                        Tables attaching to each other must be given the same memory.
+        :param name:    The name of the shared memory of the table to attach to, or None to make a new one.
+        """
+        self._shared = None
+        self.name = name
+        self._owner = name is None
+        super().__init__(memory)
+
+    def resize(self, memory):
+        """
+        Makes the table use a new amount of memory, emptying it.
+        Only the process that made the table may resize it, and other processes need to attach to it again after.
+        :param memory:  The most bytes the table may use. It's rounded down to a power of two buckets.
+        """
+        if self._shared is not None:
+            if not self._owner:
+                raise ValueError('only the process that made a shared table can resize it')
+            self.close()
+            self.unlink()
+        # This needs Python 3.8, so it's only imported once a shared table is made, and the rest of the module doesn't.
+        from multiprocessing import shared_memory
+        self._set_size(memory)
+        # Shared memory may be rounded up to a whole page, so only the start of it is used.
+        if self._owner:
+            self._shared = shared_memory.SharedMemory(create=True, size=self._memory)
+            self.name = self._shared.name
+        else:
+            self._shared = shared_memory.SharedMemory(name=self.name)
+        self._words = self._shared.buf[:self._memory].cast('Q')
+        if self._owner:
+            self.clear()
+        else:
+            self._reset_statistics()
+
+    def memory(self):
+        """
+        Returns how many bytes the table uses, to attach other processes to it with.
+        """
+        return self._memory
+
+    def clear(self):
+        """
+        Empties the table for every process using it, keeping its size.
+        """
+        self._shared.buf[:self._memory] = bytes(self._memory)
+        self._reset_statistics()
+
+    def close(self):
+        """
+        Lets go of the shared memory in this process. The table can't be used in this process afterwards.
+        """
+        self._words.release()
+        self._shared.close()
+
+    def unlink(self):
+        """
+        Frees the shared memory once every process has closed it.
+        Only the process that made the table should call this.
+        """
+        self._shared.unlink()
@@ -0,0 +1,204 @@
+"""
+A module to build a tablebase of every game reachable from some starting game, by retrograde analysis.
+
+Rather than recursing down from the start like min_max_value, the generator works a whole ply at a time.
+It first plays every action of every game in a ply at once to find the next ply, classifying games as over
+with the batched checks from tictactoebatch, until no games are left going.
+Then it walks back from the last ply, where every game is over, giving each game in a ply the best value
+of its successors in the ply after it.
+
+The rules are the same as min_max_value's: the center of a 3d game is never played,
+x wins if both players have three in a row, and a player with no actions loses.
+Games are kept as bitboards packed into one uint64, x's marks in the low bits and o's above them, while generating.
+
+The finished tablebase keeps no keys. Every game reachable from the start is the start plus some x's and o's
+in the cells that were free, so it's numbered like tictactoerank numbers games, but among those free cells only:
+a block for each number of moves made, and inside it the rank of x's new cells times the ways o could have
+moved, plus the rank of o's new cells among the free cells x left. A value is found straight from that number,
+and values are packed four to a byte, two bits each, with 0 kept for numbers of games that can't be reached.
+A 3d tablebase from a blank game is far too big to build; it's meant for games a good way in.
+"""
+
+import numpy as np
+# Use this to classify whole plies of games at once.
+import tictactoebatch
+# Use this to rank the cells each player took.
+from tictactoerank import BINOMIAL, rank_subsets
+
+
+class Tablebase:
+    """
+    The values of every game reachable from a starting game, for X, like min_max_value.
+    """
+
+    def __init__(self, game, turn, keys, values):
+        """
+        Packs up the output of generate.
+        :param game:    The 2d or 3d tic-tac-toe structure the games were reached from.
+        :param turn:    A boolean indicating if it was x's turn (True) or not (False) in the starting game.
+        :param keys:    A uint64 array of every game's packed marks.
+        :param values:  An int8 array of every game's value, in the same order as the keys.
+        """
+        game = np.asarray(game, dtype=bool)
+        self.ndim = game.ndim - 1
+        self.cells = 3 ** self.ndim
+        self.start = pack_games(game[np.newaxis])[0]
+        taken = self.start | self.start >> np.uint64(self.cells)
+        # The cells the games were played in, leaving out the center of a cube.
+        self.free = np.array([cell for cell in range(self.cells) if not int(taken) >> cell & 1
+                              and (self.ndim == 2 or cell != self.cells // 2)], dtype=np.uint64)
+        moves = np.arange(len(self.free) + 1)
+        # How many of the moves x made after each number of moves, and how many o made.
+        self.x_moves = (moves + turn) // 2
+        self.o_moves = moves - self.x_moves
+        free_count = len(self.free)
+        sizes = BINOMIAL[free_count, self.x_moves] * BINOMIAL[free_count - self.x_moves, self.o_moves]
+        self.offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+
+        # Each value is stored plus two, so it fits in two bits and 0 is left for games that aren't in the tablebase.
+        codes = np.zeros(-(-int(self.offsets[-1]) // 4) * 4, dtype=np.uint8)
+        codes[self._indices(keys)] = values + 2
+        quads = codes.reshape(len(codes) // 4, 4)
+        self.packed = (quads[:, 0] | quads[:, 1] << 2 | quads[:, 2] << 4 | quads[:, 3] << 6).astype(np.uint8)
+        self.size = len(keys)
+
+    def __len__(self):
+        return self.size
+
+    def _indices(self, keys):
+        """
+        Numbers games, which are assumed to be reachable from the start.
+        :param keys:    A uint64 array of packed games.
+        :return:        An int64 array of their numbers.
+        """
+        x_new = ((keys[:, np.newaxis] >> self.free) & np.uint64(1)).astype(bool)
+        o_new = ((keys[:, np.newaxis] >> (self.free + np.uint64(self.cells))) & np.uint64(1)).astype(bool)
+        x_count = x_new.sum(axis=1)
+        o_count = o_new.sum(axis=1)
+        positions = np.broadcast_to(np.arange(len(self.free)), x_new.shape)
+        # o's cells are numbered among the cells x left, so each one moves down by the number of x's before it.
+        o_positions = positions - (np.cumsum(x_new, axis=1) - x_new)
+        return (self.offsets[x_count + o_count] + rank_subsets(x_new, positions) *
+                BINOMIAL[len(self.free) - x_count, o_count] + rank_subsets(o_new, o_positions))
+
+    def value(self, index):
+        """
+        Unpacks the value of the game with some number.
+        :param index:   The number of the game.
+        :return:        1 if x wins, 0 for a tie, and -1 if o wins, or None if the game isn't in the tablebase.
+        """
+        code = int(self.packed[index >> 2] >> ((index & 3) * 2) & 3)
+        return code - 2 if code else None
+
+    def lookup(self, game):
+        """
+        Looks up the value of a game.
+        :param game:    The 2d or 3d tic-tac-toe structure.
+        :return:        1 if x wins, 0 for a tie, and -1 if o wins, or None if the game isn't in the tablebase.
+        """
+        key = pack_games(np.asarray(game)[np.newaxis])[0]
+        free_bits = sum(1 << int(cell) for cell in self.free)
+        added = int(key) & ~int(self.start)
+        # Only games with the start's marks and new marks in free cells, in the right counts for whose turn it was,
+        # are numbered.
+        if int(self.start) & ~int(key) or added & ~(free_bits | free_bits << self.cells):
+            return None
+        x_count = bin(added & free_bits).count('1')
+        o_count = bin(added >> self.cells).count('1')
+        moves = x_count + o_count
+        if moves >= len(self.x_moves) or (x_count, o_count) != (self.x_moves[moves], self.o_moves[moves]):
+            return None
+        return self.value(int(self._indices(np.array([key], dtype=np.uint64))[0]))
+
+
+def pack_games(games):
+    """
+    Packs a stack of games into bitboards, cells numbered the way numpy flattens the array.
+    :param games:   A (N, 2, 3, 3) or (N, 2, 3, 3, 3) stack of games.
+    :return:        A uint64 array of length N, with x's marks in the low bits and o's above them.
+    """
+    games = np.asarray(games, dtype=bool)
+    flat = games.reshape(len(games), 2 * 3 ** (games.ndim - 2))
+    weights = np.uint64(1) << np.arange(flat.shape[1], dtype=np.uint64)
+    return (flat * weights).sum(axis=1, dtype=np.uint64)
+
+
+def unpack_games(keys, ndim):
+    """
+    Unpacks a uint64 array of bitboards back into a stack of games.
+    :param keys:    A uint64 array of packed games.
+    :param ndim:    The number of dimensions of the games (2 or 3).
+    :return:        A (N, 2, 3, 3) or (N, 2, 3, 3, 3) stack of games.
+    """
+    cells = 3 ** ndim
+    shifts = np.arange(2 * cells, dtype=np.uint64)
+    flat = (keys[:, np.newaxis] >> shifts) & np.uint64(1)
+    return flat.astype(bool).reshape((len(keys), 2) + (3,) * ndim)
+
+
+def generate(game, turn):
+    """
+    Builds the tablebase of every game reachable from a game.
+    :param game:    The 2d or 3d tic-tac-toe structure to start from.
+    :param turn:    A boolean indicating if it's x's turn (True) or not (False).
+    :return:        A Tablebase holding every game reachable from the game, including the game itself.
+    """
+    game = np.asarray(game, dtype=bool)
+    ndim = game.ndim - 1
+    cells = 3 ** ndim
+    # The center is never played in 3d.
+    playable = [cell for cell in range(cells) if ndim == 2 or cell != cells // 2]
+    playable_mask = np.uint64(sum(1 << cell for cell in playable))
+    cell_bits = np.uint64(1) << np.array(playable, dtype=np.uint64)
+
+    # Going forwards, each ply is the sorted games reached after some number of moves, and which of them are going.
+    plies = []
+    values = []
+    keys = pack_games(game[np.newaxis])
+    mover = turn
+    while len(keys):
+        status = tictactoebatch.status_batch(unpack_games(keys, ndim))
+        ply_values = np.zeros(len(keys), dtype=np.int8)
+        ply_values[status.o_won] = -1
+        ply_values[status.x_won] = 1
+        empty = ~(keys | keys >> np.uint64(cells)) & playable_mask
+        # A player with no actions left loses, even if some cell is still empty.
+        stuck = status.ongoing & (empty == 0)
+        ply_values[stuck] = -1 if mover else 1
+        going = status.ongoing & ~stuck
+        plies.append((keys, going, mover))
+        values.append(ply_values)
+
+        moves = _moves(keys[going], cell_bits, cells, mover)
+        keys = np.unique(moves[moves != 0])
+        mover = not mover
+
+    # Going backwards, every game in the last ply is over, and each ply before takes its values from the next.
+    for ply in range(len(plies) - 2, -1, -1):
+        keys, going, mover = plies[ply]
+        next_keys = plies[ply + 1][0]
+        moves = _moves(keys[going], cell_bits, cells, mover)
+        legal = moves != 0
+        successor_values = values[ply + 1][np.searchsorted(next_keys, moves)]
+        # X takes the best of its successors and O the worst, and illegal moves are never taken.
+        if mover:
+            values[ply][going] = np.where(legal, successor_values, -2).max(axis=1)
+        else:
+            values[ply][going] = np.where(legal, successor_values, 2).min(axis=1)
+
+    return Tablebase(game, turn, np.concatenate([keys for keys, _, _ in plies]), np.concatenate(values))
+
+
+def _moves(keys, cell_bits, cells, mover):
+    """
+    Plays every playable cell in every game of a stack at once.
+    :param keys:        A uint64 array of packed games that are going.
+    :param cell_bits:   A uint64 array of the bit of each playable cell.
+    :param cells:       The number of cells in a game, which is how far o's marks are shifted.
+    :param mover:       True if x is placing the marks, False if o is.
+    :return:            A (N, playable cells) uint64 array of the games after each move, 0 where the cell is taken.
+    """
+    taken = (keys | keys >> np.uint64(cells))[:, np.newaxis]
+    free = (taken & cell_bits) == 0
+    marks = cell_bits if mover else cell_bits << np.uint64(cells)
+    return np.where(free, keys[:, np.newaxis] | marks, np.uint64(0))
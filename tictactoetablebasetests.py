@@ -0,0 +1,68 @@
+"""
+A collection of unit-tests for tictactoetablebase.py.
+"""
+
+import unittest
+# Use this to build stacks of games.
+import numpy as np
+# The functions we are testing are from this module.
+import tictactoetablebase
+# The numbering a tablebase from a blank board should match.
+import tictactoerank
+# The search the tablebase should agree with.
+import tictactoesearch
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+
+class TestGenerate(unittest.TestCase):
+    """
+    A test case for the tictactoetablebase.generate function.
+    """
+
+    def test_2d(self):
+        """
+        2d tic tac toe has 5478 games reachable from a blank board, and it's a tie.
+        """
+        tablebase = tictactoetablebase.generate(data.BLANK_GAME_2D, True)
+        self.assertEqual(len(tablebase), 5478)
+        # Values are kept for every number tictactoerank gives a 2d game, two bits each, and no keys.
+        self.assertEqual(len(tablebase.packed), -(-tictactoerank.count(2) // 4))
+        self.assertEqual(tablebase.lookup(data.BLANK_GAME_2D), 0)
+        self.assertEqual(tablebase.lookup(data.MIDGAME_2D), 1)
+        self.assertEqual(tablebase.lookup(data.X_WON_2D), 1)
+        # The tied example has more o's than x's, so it can't be reached from a blank board.
+        self.assertIsNone(tablebase.lookup(data.TIED_2D))
+        self.assertEqual(tictactoetablebase.generate(data.TIED_2D, True).lookup(data.TIED_2D), 0)
+
+    def test_matches_min_max_value(self):
+        """
+        Games near the end should get the same values as min_max_value, for either player to move.
+        """
+        for game in (data.FIVE_FROM_FILLED, data.NINE_FROM_FILLED, data.TEN_FROM_FILLED, data.ELEVEN_FROM_FILLED):
+            for turn in (True, False):
+                tablebase = tictactoetablebase.generate(game, turn)
+                self.assertEqual(tablebase.lookup(game), tictactoesearch.min_max_value(
+                    tictactoesearch.TicTacToeWrapper(game), turn))
+
+    def test_every_successor(self):
+        """
+        Every game one move from the start should be in the tablebase, with the value min_max_value gives it.
+        """
+        tablebase = tictactoetablebase.generate(data.TEN_FROM_FILLED, False)
+        wrapper = tictactoesearch.TicTacToeWrapper(data.TEN_FROM_FILLED)
+        for action in tictactoesearch.possible_actions(wrapper):
+            successor = tictactoesearch.play(wrapper, action, False)
+            self.assertEqual(tablebase.lookup(successor.data), tictactoesearch.min_max_value(successor, True))
+
+    def test_pack_round_trip(self):
+        """
+        Packing and unpacking a stack of games should give back the same games.
+        """
+        games = np.stack([data.ONE_FILLED, data.SEVEN_FILLED, data.ELEVEN_FROM_FILLED])
+        keys = tictactoetablebase.pack_games(games)
+        self.assertTrue((tictactoetablebase.unpack_games(keys, 3) == games).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
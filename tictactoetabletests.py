@@ -0,0 +1,140 @@
+"""
+A collection of unit-tests for tictactoetable.py.
+"""
+
+import unittest
+# The class we are testing is from this module.
+from tictactoetable import TranspositionTable, SharedTranspositionTable, EXACT, LOWER, UPPER
+
+
+class TestTranspositionTable(unittest.TestCase):
+    """
+    A test case for the tictactoetable.TranspositionTable class.
+    """
+
+    def test_store_and_probe(self):
+        """
+        Stored entries should come back as they went in, and missing ones not at all.
+        """
+        table = TranspositionTable(1 << 16)
+        table.store(0, -1, UPPER, 26)
+        table.store(12345, 700, LOWER, 3)
+        self.assertEqual(table.probe(0), (-1, UPPER, 26))
+        self.assertEqual(table.probe(12345), (700, LOWER, 3))
+        self.assertIsNone(table.probe(54321))
+        self.assertEqual(len(table), 2)
+
+    def test_best_move(self):
+        """
+        A move stored with an entry should come back without changing what probe gives.
+        """
+        table = TranspositionTable(1 << 16)
+        table.store(77, 1, LOWER, 9, 26)
+        table.store(78, 0, EXACT, 9)
+        self.assertEqual(table.probe(77), (1, LOWER, 9))
+        self.assertEqual(table.best_move(77), 26)
+        self.assertIsNone(table.best_move(78))
+        self.assertIsNone(table.best_move(79))
+
+    def test_memory_budget(self):
+        """
+        A table should never hold more entries than fit in its memory, keeping the deepest ones.
+        """
+        table = TranspositionTable(64)
+        self.assertEqual(table.capacity(), 4)
+        for key in range(100):
+            table.store(key, 0, EXACT, 50 if key == 7 else 1)
+        self.assertLessEqual(len(table), 4)
+        self.assertEqual(table.probe(7), (0, EXACT, 50))
+        self.assertEqual(table.probe(99), (0, EXACT, 1))
+
+    def test_two_tiers(self):
+        """
+        An entry pushed out of the depth-preferred slot should move to the always-replace slot,
+        and storing a key again should replace its entry rather than add another.
+        """
+        table = TranspositionTable(32)
+        self.assertEqual(table.capacity(), 2)
+        table.store(1, 0, EXACT, 5)
+        table.store(2, 0, EXACT, 9)
+        self.assertEqual((table.probe(1), table.probe(2)), ((0, EXACT, 5), (0, EXACT, 9)))
+        table.store(3, 0, EXACT, 1)
+        self.assertIsNone(table.probe(1))
+        self.assertEqual(table.info().collisions, 1)
+        # Each key is overwritten where it is, even by a shallower entry.
+        table.store(2, 1, LOWER, 3)
+        table.store(3, -1, UPPER, 0)
+        self.assertEqual((table.probe(2), table.probe(3)), ((1, LOWER, 3), (-1, UPPER, 0)))
+        self.assertEqual((len(table), table.info().collisions), (2, 1))
+        # A key in the always-replace slot stored deeper moves up, leaving only one entry for it.
+        table.store(3, 0, EXACT, 4)
+        self.assertEqual((table.probe(2), table.probe(3)), ((1, LOWER, 3), (0, EXACT, 4)))
+        self.assertEqual((len(table), table.info().collisions), (2, 1))
+        table.store(4, 0, EXACT, 8)
+        self.assertEqual((table.probe(3), table.probe(4)), ((0, EXACT, 4), (0, EXACT, 8)))
+        self.assertIsNone(table.probe(2))
+        self.assertEqual((len(table), table.info().collisions), (2, 2))
+
+    def test_clear_and_resize(self):
+        """
+        Clearing or resizing a table should forget everything in it.
+        """
+        table = TranspositionTable(1 << 10)
+        table.store(1, 1, EXACT, 1)
+        table.clear()
+        self.assertIsNone(table.probe(1))
+        table.store(1, 1, EXACT, 1)
+        table.resize(1 << 12)
+        self.assertIsNone(table.probe(1))
+        self.assertEqual(table.capacity(), 1 << 8)
+
+
+class TestSharedTranspositionTable(unittest.TestCase):
+    """
+    A test case for the tictactoetable.SharedTranspositionTable class.
+    """
+
+    def setUp(self):
+        self.table = SharedTranspositionTable(1 << 12)
+        self.attached = SharedTranspositionTable(self.table.memory(), self.table.name)
+
+    def tearDown(self):
+        self.attached.close()
+        self.table.close()
+        self.table.unlink()
+
+    def test_shared_entries(self):
+        """
+        Entries stored through one handle should be seen through another, and clearing should clear both.
+        """
+        self.table.store(12345, -1, LOWER, 20)
+        self.attached.store(999, 1, UPPER, 2)
+        self.assertEqual(self.attached.probe(12345), (-1, LOWER, 20))
+        self.assertEqual(self.table.probe(999), (1, UPPER, 2))
+        self.attached.clear()
+        self.assertIsNone(self.table.probe(12345))
+
+    def test_torn_slot(self):
+        """
+        A slot whose key word and data word come from different stores should read as a miss.
+        """
+        self.table.store(1, 1, EXACT, 5)
+        index = self.table._bucket(1)  # pylint: disable=W0212
+        words = self.table._words  # pylint: disable=W0212
+        words[index + 1] ^= 1
+        self.assertIsNone(self.table.probe(1))
+
+    def test_only_owner_resizes(self):
+        """
+        Only the process that made the table should be able to resize it.
+        """
+        with self.assertRaises(ValueError):
+            self.attached.resize(1 << 14)
+        self.table.store(1, 1, EXACT, 1)
+        self.table.resize(1 << 14)
+        self.assertIsNone(self.table.probe(1))
+        self.assertEqual(self.table.capacity(), 1 << 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+A module to find wins made of forcing moves in tic tac toe, by threat-space search.
+
+A threat is a line with two of the attacker's marks and an empty cell, so the defender has to mark that cell next.
+The search only tries attacking moves that make a threat, and the defender only gets the one reply that blocks it,
+so it looks along a handful of narrow lines of play instead of the whole tree.
+An attacking move that makes two threats at once is a fork, which the defender can't block, so it wins.
+
+A sequence found this way is a real forced win, so it can settle a game before any full search.
+Not finding one doesn't mean there's no win, since quiet moves are never tried.
+"""
+
+import tictactoebitboard
+
+# Every line as a bitboard mask, to find the lines an attacker has one mark on and nothing else.
+_LINES = tictactoebitboard.LINES
+
+
+def threat_candidates(mine, theirs):
+    """
+    Finds the moves that would make a threat, from the lines with one of our marks and no marks of theirs.
+    :param mine:    The bits of the marks of the attacker.
+    :param theirs:  The bits of the marks of the defender.
+    :return:        A mask of the playable cells that would make a threat.
+    """
+    empty = ~(mine | theirs) & tictactoebitboard.PLAYABLE
+    candidates = 0
+    for line in _LINES:
+        if not line & theirs and line & mine and (line & mine) & ((line & mine) - 1) == 0:
+            # Both other cells have to be playable, or the threat could never be carried out.
+            if line & ~mine & ~empty == 0:
+                candidates |= line & empty
+    return candidates
+
+
+def threat_sequence(mine, theirs, max_depth=None):
+    """
+    Looks for a forced win for the player to move made only of threats.
+    The game is assumed not to be over.
+    :param mine:        The bits of the marks of the player to move.
+    :param theirs:      The bits of the marks of the other player.
+    :param max_depth:   The most attacking moves to look ahead, or None for no limit.
+    :return:            A list of cell numbers, the attacker's moves and the defender's forced replies in turn,
+                        ending with the winning move, or None if no such win was found.
+    """
+    return _search(mine, theirs, max_depth if max_depth is not None else tictactoebitboard.CELLS, {})
+
+
+def _search(mine, theirs, depth, failed):
+    """
+    Recursively looks for a win made of threats.
+    :param mine:    The bits of the marks of the attacker, who is to move.
+    :param theirs:  The bits of the marks of the defender.
+    :param depth:   How many more attacking moves to try.
+    :param failed:  A dictionary shared across the search, from the (mine, theirs) pairs already searched
+                    without a win to the depth they were searched to.
+    :return:        A list of cell numbers, or None.
+    """
+    empty = ~(mine | theirs) & tictactoebitboard.PLAYABLE
+    wins = tictactoebitboard.winning_cells(mine, empty)
+    if wins:
+        return [(wins & -wins).bit_length() - 1]
+    if not depth or failed.get((mine, theirs), -1) >= depth:
+        return None
+    # If the defender has a threat of their own, we have to block it, and the block has to be a threat too.
+    blocks = tictactoebitboard.winning_cells(theirs, empty)
+    if blocks & (blocks - 1):
+        return None
+    candidates = threat_candidates(mine, theirs)
+    if blocks:
+        candidates &= blocks
+
+    for cell in tictactoebitboard.cells(candidates):
+        new_mine = mine | (1 << cell)
+        new_empty = empty & ~(1 << cell)
+        threats = tictactoebitboard.winning_cells(new_mine, new_empty)
+        # The defender answers a threat by winning if they can, before blocking anything.
+        if tictactoebitboard.winning_cells(theirs, new_empty):
+            continue
+        if threats & (threats - 1):
+            # The defender can only block one of two threats, and whichever it is, we finish the other.
+            reply = (threats & -threats).bit_length() - 1
+            return [cell, reply, (threats ^ (1 << reply)).bit_length() - 1]
+        reply = threats.bit_length() - 1
+        rest = _search(new_mine, theirs | (1 << reply), depth - 1, failed)
+        if rest is not None:
+            return [cell, reply] + rest
+    failed[(mine, theirs)] = depth
+    return None
+
+
+def threat_win(wrapper, turn, max_depth=None):
+    """
+    Looks for a forced win for the player to move made only of threats, in a wrapped game.
+    :param wrapper:     The TicTacToeWrapper to search, which should not be over.
+    :param turn:        A boolean indicating if it's x's turn (True) or not (False).
+    :param max_depth:   The most attacking moves to look ahead, or None for no limit.
+    :return:            A list of coordinate tuples, the moves of both players in turn, or None if no win was found.
+    """
+    x_bits, o_bits = tictactoebitboard.unpack(wrapper.key)
+    mine, theirs = (x_bits, o_bits) if turn else (o_bits, x_bits)
+    sequence = threat_sequence(mine, theirs, max_depth)
+    return None if sequence is None else [tictactoebitboard.cell_coordinate(cell) for cell in sequence]
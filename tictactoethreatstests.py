@@ -0,0 +1,70 @@
+"""
+A collection of unit-tests for tictactoethreats.py.
+"""
+
+import unittest
+# The functions we are testing are from this module.
+import tictactoethreats
+# The exact search the wins are checked with.
+import tictactoebitboard
+import tictactoesearch
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+# Every 3d example, including every frame of the recorded games.
+EXAMPLES_3D = [value for value in vars(data).values()
+               if hasattr(value, 'shape') and value.shape == (2, 3, 3, 3)] + data.GAME_1 + data.GAME_2
+
+
+class TestThreatWin(unittest.TestCase):
+    """
+    A test case for the tictactoethreats.threat_win function.
+    """
+
+    def test_sequences_win(self):
+        """
+        Every sequence found should be a win for alpha-beta, and playing it out should end in a win.
+        """
+        found = 0
+        for game in EXAMPLES_3D:
+            wrapper = tictactoesearch.TicTacToeWrapper(game)
+            if tictactoesearch.utility(wrapper) is not None:
+                continue
+            for turn in (True, False):
+                sequence = tictactoethreats.threat_win(wrapper, turn)
+                if sequence is None:
+                    continue
+                found += 1
+                self.assertEqual(tictactoesearch.alpha_beta_value(wrapper, turn), 1 if turn else -1)
+                played, mover = wrapper, turn
+                for action in sequence:
+                    self.assertIsNone(tictactoesearch.utility(played))
+                    self.assertIn(action, tictactoesearch.possible_actions(played))
+                    played = tictactoesearch.play(played, action, mover)
+                    mover = not mover
+                self.assertEqual(played.winner, 0 if turn else 1)
+        self.assertGreater(found, 0)
+
+    def test_fork(self):
+        """
+        Two opposite corners of a face make a fork at either of the other corners, which wins in one move.
+        """
+        mine = 1 | (1 << 8)
+        theirs = (1 << 4) | (1 << 26)
+        sequence = tictactoethreats.threat_sequence(mine, theirs)
+        self.assertEqual(len(sequence), 3)
+        empty = ~(mine | theirs | (1 << sequence[0])) & tictactoebitboard.PLAYABLE
+        threats = tictactoebitboard.winning_cells(mine | (1 << sequence[0]), empty)
+        self.assertGreater(bin(threats).count('1'), 1)
+
+    def test_no_threats(self):
+        """
+        A blank board has no threats to make, and a depth of zero only finds immediate wins.
+        """
+        self.assertIsNone(tictactoethreats.threat_sequence(0, 0))
+        self.assertEqual(tictactoethreats.threat_candidates(0, 0), 0)
+        self.assertEqual(tictactoethreats.threat_sequence(1 | (1 << 1), 1 << 9, 0), [2])
+
+
+if __name__ == '__main__':
+    unittest.main()
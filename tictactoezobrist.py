@@ -0,0 +1,40 @@
+"""
+A module of Zobrist hashing for 3d tic-tac-toe games.
+
+A Zobrist hash XORs together a random 64 bit key for every (player, cell) mark in a game,
+so placing a mark only takes one XOR to update the hash.
+"""
+
+# Use this to draw the random keys.
+import numpy as np
+# Use this to go through the marks of a bitboard.
+import tictactoebitboard
+
+# The keys are drawn from a fixed seed so every process hashes games the same way.
+ZOBRIST_KEYS = tuple(tuple(int(key) for key in player_keys)
+                     for player_keys in np.random.default_rng(4100).integers(
+                         0, 1 << 64, size=(2, tictactoebitboard.CELLS), dtype=np.uint64, endpoint=False))
+
+
+def zobrist_hash(board):
+    """
+    Hashes every mark of a bitboard.
+    :param board:   A tuple of the x bits and the o bits.
+    :return:        The 64 bit Zobrist hash of the game.
+    """
+    hash_value = 0
+    for player, bits in enumerate(board):
+        for cell in tictactoebitboard.cells(bits):
+            hash_value ^= ZOBRIST_KEYS[player][cell]
+    return hash_value
+
+
+def toggle(hash_value, cell, player):
+    """
+    Updates a Zobrist hash for a mark being placed or removed.
+    :param hash_value:  The Zobrist hash of the game before the change.
+    :param cell:        The cell number of the mark.
+    :param player:      0 for an x mark, 1 for an o mark.
+    :return:            The Zobrist hash of the game after the change.
+    """
+    return hash_value ^ ZOBRIST_KEYS[player][cell]
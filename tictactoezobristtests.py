@@ -0,0 +1,48 @@
+"""
+A collection of unit-tests for tictactoezobrist.py.
+"""
+
+import unittest
+# Use this to read the marks of the examples.
+import tictactoebitboard as bitboard
+# The functions we are testing are from this module.
+import tictactoezobrist
+# The data and examples necessary to test this function are from here.
+import tictactoedata as data
+
+
+class TestZobrist(unittest.TestCase):
+    """
+    A test case for tictactoezobrist.zobrist_hash and tictactoezobrist.toggle.
+    """
+
+    def test_toggle_matches_hash(self):
+        """
+        Placing the marks of a recorded game one at a time should give the hash of each frame, and removing them again
+        should give back the hash of the blank game.
+        """
+        for game in (data.GAME_1, data.GAME_2):
+            hash_value = tictactoezobrist.zobrist_hash((0, 0))
+            placed = []
+            for frame in game:
+                x_bits, o_bits = bitboard.from_array(frame)
+                for player, bits in enumerate((x_bits, o_bits)):
+                    for cell in bitboard.cells(bits):
+                        if (player, cell) not in placed:
+                            hash_value = tictactoezobrist.toggle(hash_value, cell, player)
+                            placed.append((player, cell))
+                self.assertEqual(hash_value, tictactoezobrist.zobrist_hash((x_bits, o_bits)))
+            for player, cell in placed:
+                hash_value = tictactoezobrist.toggle(hash_value, cell, player)
+            self.assertEqual(hash_value, 0)
+
+    def test_players_differ(self):
+        """
+        The same cell should hash differently for x and for o.
+        """
+        for cell in range(bitboard.CELLS):
+            self.assertNotEqual(tictactoezobrist.toggle(0, cell, 0), tictactoezobrist.toggle(0, cell, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()